@@ -1,17 +1,30 @@
 import os
-import sqlite3
 import datetime
 import asyncio
-from collections import defaultdict
-from typing import List, Dict
+import multiprocessing
+from typing import List, Dict, Iterable, Iterator
+from itertools import islice
 import csv
 from eth_account import Account
 from colorama import Fore, Style, init
 import logging
 
-from async_utils.async_balance_native import AsyncTokenBalanceChecker
+from async_utils.async_balance_scan import AsyncBalanceScanner
 from sync_utils.create_evm_wallet import generate
 from async_utils.async_buy_monad import AsyncGasZipBuyMonad
+from async_utils.async_provider import provider_pool
+from async_utils.async_chain_info import chain_info
+from async_utils.async_gas_oracle import gas_oracle
+from async_utils.async_receipt_tracker import receipt_tracker
+from async_utils.async_scheduler import AsyncTaskScheduler
+from async_utils.async_db import database
+from async_utils.async_wallets import Wallet, iter_wallets, iter_addresses, count_wallets
+from async_utils.async_route_plan import route_plan, now_str
+from async_utils.async_job_queue import job_queue
+from async_utils.async_limits import endpoint_limiter
+from async_utils.async_http import http_sessions
+from async_utils.async_proxy_health import proxy_health
+from sync_utils.db_schema import migrate, RECORD_RUN_SQL
 
 from async_tasks.async_monorail.swapper import MONORAIL
 from async_tasks.async_nft.async_Lil_Chogstars import LilChogstarsMinter
@@ -22,7 +35,9 @@ from async_tasks.async_main_site.async_DAK.buy_dak_with_main_site import BUY_DAK
 from async_tasks.async_main_site.async_CHOG.buy_chog_with_main_site import BUY_CHOG
 from async_tasks.async_main_site.async_YAKI.buy_yaki_with_main_site import BUY_YAKI
 
-from config import wallets, arb_rpc, monad_rpc, PROXY_FILE, DB_NAME
+from config import (wallets, arb_rpc, monad_rpc, PROXY_FILE, AUTO_ROUTE_MODE, IMPORT_CHUNK_SIZE,
+                    WALLET_PAGE_SIZE, BALANCE_SCAN_PAGE_SIZE, MIN_ROUTE_BALANCE, ROUTE_PROCESSES,
+                    ROUTE_PROGRESS_INTERVAL, JOB_POLL_INTERVAL, MAX_WORKERS)
 
 init(autoreset=True)
 logging.basicConfig(filename='wallet_log.txt', level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -40,11 +55,7 @@ async def print_banner():
     """ + Style.RESET_ALL)
     print(Fore.YELLOW + f"Bot start: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n" + Style.RESET_ALL)
 
-async def load_wallets_from_csv(csv_path: str) -> List[Dict]:
-    results = []
-    if not os.path.exists(csv_path):
-        print(f"File {csv_path} not found!")
-        return results
+def iter_wallets_from_csv(csv_path: str) -> Iterator[Dict]:
     with open(csv_path, "r", encoding="utf-8") as f:
         reader = csv.DictReader(f, delimiter='|')
         for row in reader:
@@ -53,14 +64,23 @@ async def load_wallets_from_csv(csv_path: str) -> List[Dict]:
                 if pk:
                     acct = Account.from_key(pk)
                     row['address'] = acct.address
-            results.append(dict(row))
-    return results
+            yield dict(row)
+
+def iter_wallets_from_private_keys(private_keys_file: str) -> Iterator[Dict]:
+    with open(private_keys_file, "r", encoding="utf-8") as f:
+        for line in f:
+            private_key = line.strip()
+            if not private_key:
+                continue
+            try:
+                yield {'address': Account.from_key(private_key).address, 'private_key': private_key}
+            except Exception as e:
+                print(Fore.RED + f"❌ Error: {private_key[:10]}... -> {e}" + Style.RESET_ALL)
 
 async def load_wallets_from_list(list_data: List[Dict]) -> List[Dict]:
     res = []
     for item in list_data:
         pk = item.get('private_key') or item.get('key')
-        proxy = item.get('proxy')
         if pk:
             acct = Account.from_key(pk)
             address = acct.address
@@ -78,127 +98,93 @@ async def load_wallets_from_private_keys():
     if not os.path.exists(private_keys_file):
         print(Fore.RED + f"❌ File {private_keys_file} not found!" + Style.RESET_ALL)
         return
-    with open(private_keys_file, "r", encoding="utf-8") as f:
-        private_keys = [line.strip() for line in f.readlines() if line.strip()]
-    if not private_keys:
+    added, skipped = await import_wallets(iter_wallets_from_private_keys(private_keys_file))
+    if not added and not skipped:
         print(Fore.YELLOW + "⚠️ File is empty. Add private keys to file" + Style.RESET_ALL)
         return
-    wallets_list = []
-    for private_key in private_keys:
-        try:
-            acct = Account.from_key(private_key)
-            wallet_data = {
-                'address': acct.address,
-                'private_key': private_key
-            }
-            wallets_list.append(wallet_data)
-        except Exception as e:
-            print(Fore.RED + f"❌ Error: {private_key[:10]}... -> {e}" + Style.RESET_ALL)
-    if wallets_list:
-        await add_wallets_bulk(wallets_list)
-        print(Fore.GREEN + f"✅ Successfully added {len(wallets_list)} wallets from {private_keys_file}!" + Style.RESET_ALL)
+    print(Fore.GREEN + f"✅ Successfully added {added} wallets from {private_keys_file}, skipped (duplicates): {skipped}!" + Style.RESET_ALL)
 
 async def clear_all_wallets():
-    with sqlite3.connect(DB_NAME) as conn:
-        cur = conn.cursor()
-        cur.execute("DELETE FROM wallets")
-        conn.commit()
+    await database.execute("DELETE FROM wallets")
     print("ALL WALLETS CLEAR!")
 
 async def init_db():
-    with sqlite3.connect(DB_NAME) as conn:
-        cur = conn.cursor()
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS wallets (
-                address TEXT PRIMARY KEY,
-                private_key TEXT,
-                proxy TEXT,
-                balance REAL,
-                last_run_bean DATETIME,
-                last_run_kinza DATETIME,
-                last_run_magma DATETIME,
-                last_run_chog DATETIME,
-                last_run_dak DATETIME,
-                last_run_yaki DATETIME,
-                last_run_monorail DATETIME,
-                last_run_nft DATETIME,
-                last_run_pandaria DATETIME
-            )
-        """)
-        conn.commit()
-
-async def get_all_wallets() -> List[Dict]:
-    with sqlite3.connect(DB_NAME) as conn:
-        conn.row_factory = sqlite3.Row
-        cur = conn.cursor()
-        rows = cur.execute("SELECT * FROM wallets").fetchall()
-        return [dict(r) for r in rows]
-
-async def add_wallet_to_db(address: str, private_key: str, proxy: str = None) -> bool:
-    with sqlite3.connect(DB_NAME) as conn:
-        cur = conn.cursor()
-        cur.execute("SELECT address FROM wallets WHERE address = ?", (address,))
-        row = cur.fetchone()
-        if row:
-            return False
-        if proxy is None:
-            proxies = await load_proxies_from_file()
-            if proxies:
-                proxy = proxies.pop(0)
-                print(f"A proxy has been issued {proxy} for {address}")
-        cur.execute("INSERT INTO wallets (address, private_key, proxy) VALUES (?, ?, ?)", 
-                    (address, private_key, proxy))
-        conn.commit()
-        return True
-
-async def add_wallets_bulk(wallets_list: List[Dict]) -> None:
-    added_count = 0
-    skipped_count = 0
-    for w in wallets_list:
-        addr = w['address']
-        pk = w['private_key']
-        proxy = w.get("proxy")
-        if await add_wallet_to_db(addr, pk, proxy):
-            added_count += 1
-        else:
-            skipped_count += 1
+    await database.call(migrate)
+
+async def import_wallets(wallets_iter: Iterable[Dict]) -> tuple:
+    # keys are parsed off the event loop in chunks; duplicates are dropped in
+    # memory and everything new lands in a single INSERT OR IGNORE executemany
+    wallets_iter = iter(wallets_iter)
+    existing = {row["address"] for row in await database.fetchall("SELECT address FROM wallets")}
+    used_proxies = {row["proxy"] for row in await database.fetchall("SELECT proxy FROM wallets WHERE proxy IS NOT NULL")}
+    free_proxies = iter([p for p in await load_proxies_from_file() if p not in used_proxies])
+    rows = []
+    skipped = 0
+    while True:
+        chunk = await asyncio.to_thread(list, islice(wallets_iter, IMPORT_CHUNK_SIZE))
+        if not chunk:
+            break
+        for w in chunk:
+            if w['address'] in existing:
+                skipped += 1
+                continue
+            existing.add(w['address'])
+            rows.append((w['address'], w['private_key'], w.get("proxy") or next(free_proxies, None)))
+    added = await database.executemany(
+        "INSERT OR IGNORE INTO wallets (address, private_key, proxy) VALUES (?, ?, ?)", rows
+    ) if rows else 0
+    return added, skipped + len(rows) - added
+
+async def add_wallets_bulk(wallets_list: Iterable[Dict]) -> None:
+    added_count, skipped_count = await import_wallets(wallets_list)
     print(f"✅ Added: {added_count}, skipped (duplicates): {skipped_count}.")
 
-async def update_balance_in_db(address: str, new_balance):
-    with sqlite3.connect(DB_NAME) as conn:
-        cur = conn.cursor()
-        new_balance_float = float(new_balance)
-        cur.execute("UPDATE wallets SET balance = ? WHERE address = ?", (new_balance_float, address))
-        conn.commit()
+async def update_balances_in_db(balances: Dict[str, float]):
+    await database.executemany("UPDATE wallets SET balance = ? WHERE address = ?",
+                               [(float(balance), address) for address, balance in balances.items()])
+
+async def scan_wallet_balances():
+    total = await count_wallets()
+    print(Fore.CYAN + f"🔎 Scanning $MON balances of {total} wallets..." + Style.RESET_ALL)
+    scanner = AsyncBalanceScanner(rpc_url=monad_rpc)
+    async for addresses in iter_addresses(BALANCE_SCAN_PAGE_SIZE):
+        await update_balances_in_db(await scanner.scan(addresses))
 
 async def print_all_wallet_addresses():
-    all_wallets = await get_all_wallets()
-    if not all_wallets:
+    if not await count_wallets():
         print("🚨In database not wallets.")
         return
     print("\n📋 List all address wallets:")
-    for idx, wallet in enumerate(all_wallets, start=1):
-        address = wallet.get('address', 'N/A')
-        print(f"{idx}. {address}")
-
-async def update_last_run(script_name: str, address: str):
-    now_str = datetime.datetime.now().isoformat(sep=' ', timespec='seconds')
-    col_name = f"last_run_{script_name}" 
-    with sqlite3.connect(DB_NAME) as conn:
-        cur = conn.cursor()
-        query = f"UPDATE wallets SET {col_name} = ? WHERE address = ?"
-        cur.execute(query, (now_str, address))
-        conn.commit()
-
-async def update_wallet_proxy(address: str, proxy: str):
-    with sqlite3.connect(DB_NAME) as conn:
-        cur = conn.cursor()
-        cur.execute("SELECT proxy FROM wallets WHERE address = ?", (address,))
-        row = cur.fetchone()
-        if row and row[0]: 
-            return
-        cur.execute("UPDATE wallets SET proxy = ? WHERE address = ?", (proxy, address))
-        conn.commit()
+    idx = 0
+    async for addresses in iter_addresses(WALLET_PAGE_SIZE):
+        for address in addresses:
+            idx += 1
+            print(f"{idx}. {address}")
+
+async def record_run(script_name: str, address: str, started_at: str, completed: bool, futures: list):
+    # a runner that stopped early is failed even if its first transactions landed
+    receipts = await receipt_tracker.wait(futures)
+    status = "success" if completed and receipts and all(r["status"] == 1 for r in receipts) else "failed"
+    if not completed:
+        print(Fore.YELLOW + f"⚠️ {script_name}: script for {address} did not finish, run marked as failed" + Style.RESET_ALL)
+    elif status != "success":
+        print(Fore.YELLOW + f"⚠️ {script_name}: transactions of {address} did not land, run marked as failed" + Style.RESET_ALL)
+    tx_hash = receipts[-1]["tx_hash"] if receipts else None
+    await database.execute(RECORD_RUN_SQL, (address, script_name, started_at, now_str(), status, tx_hash))
+    return status
+
+async def report_skipped_wallets() -> int:
+    total = await count_wallets()
+    eligible = await count_wallets(MIN_ROUTE_BALANCE, require_proxy=True, healthy_proxy=True)
+    if total > eligible:
+        print(Fore.YELLOW + f"⏩ SKIP: {total - eligible} wallets - not proxy, dead proxy or balance < {MIN_ROUTE_BALANCE}" + Style.RESET_ALL)
+    return eligible
+
+async def check_proxies(force: bool = False):
+    result = await proxy_health.check(force)
+    if result["checked"]:
+        print(Fore.CYAN + f"🩺 Checked {result['checked']} proxies: {result['ok']} ok, "
+              f"{result['failed']} failed or slow" + Style.RESET_ALL)
 
 async def load_proxies_from_file() -> List[str]:
     if os.path.exists(PROXY_FILE):
@@ -207,112 +193,112 @@ async def load_proxies_from_file() -> List[str]:
     return []
 
 async def assign_proxies_to_wallets():
-    all_wallets = await get_all_wallets()
     proxies = await load_proxies_from_file()
     if not proxies:
         print(Fore.RED + "⚠️  In file proxy.txt not enogh proxy!" + Style.RESET_ALL)
         return
-    unassigned_wallets = [w for w in all_wallets if not w.get("proxy")]
-    if not unassigned_wallets:
+    unassigned = await count_wallets() - await count_wallets(require_proxy=True)
+    if not unassigned:
         print(Fore.GREEN + "✅ All wallets already have a proxy!" + Style.RESET_ALL)
         return
-    assigned_count = 0
-    for wallet in unassigned_wallets:
-        if proxies:
-            proxy = proxies.pop(0)
-            await update_wallet_proxy(wallet["address"], proxy)
-            assigned_count += 1
-        else:
+    rows = []
+    async for row in database.iterate("SELECT address FROM wallets WHERE proxy IS NULL OR proxy = ''"):
+        if len(rows) >= len(proxies):
             break
-    print(Fore.GREEN + f"✅ Proxy issued {assigned_count} wallets. ")
+        rows.append((proxies[len(rows)], row["address"]))
+    await database.executemany("UPDATE wallets SET proxy = ? WHERE address = ?", rows)
+    print(Fore.GREEN + f"✅ Proxy issued {len(rows)} wallets. ")
 
 
-async def buy_monad(wallet: Dict):
+async def buy_monad(wallet: Wallet):
     try:
-        ins = AsyncGasZipBuyMonad(rpc=arb_rpc, private_key=wallet['private_key'])
+        ins = AsyncGasZipBuyMonad(rpc=arb_rpc, wallet=wallet)
         await ins.buy_monad_on_GasZip()
     except Exception as e:
-        print(f'Error at buy $MON for wallet {wallet["address"]}: {e}')
+        print(f'Error at buy $MON for wallet {wallet.address}: {e}')
 
 async def buy_monad_for_all_wallets():
-    all_wallets = await get_all_wallets()
-    if not all_wallets:
+    if not await count_wallets():
         print("🚨 In database not wallets")
         return
-    tasks = []
-    for wallet in all_wallets:
-        task = buy_monad(wallet)
-        tasks.append(task)
-    await asyncio.gather(*tasks)
+    jobs = ((wallet.address, lambda wallet=wallet: buy_monad(wallet)) async for wallet in iter_wallets())
+    await AsyncTaskScheduler().run(jobs)
     print("✅ Buy $MON ended.")
 
 
-async def run_kinza(wallet: Dict):
+async def run_kinza(wallet: Wallet):
     try:
-        k = Kinza(rpc_url=monad_rpc, private_key=wallet['private_key'])
+        k = Kinza(rpc_url=monad_rpc, wallet=wallet)
         await k.infinity_approve()
         await k.Kinza_supply_DAK()
-        await update_last_run("kinza", wallet['address'])
+        return True
     except Exception as e:
         print(f"[run_kinza] Error: {e}")
+        return False
 
-async def run_magma(wallet: Dict):
+async def run_magma(wallet: Wallet):
     try:
-        m = MAGMA(rpc_url=monad_rpc, private_key=wallet['private_key'])
+        m = MAGMA(rpc_url=monad_rpc, wallet=wallet)
         await m.magma_stake_mon()
         await asyncio.sleep(4)
         await m.magma_unstake_gmon()
-        await update_last_run("magma", wallet['address'])
+        return True
     except Exception as e:
         print(f"[run_magma] Error: {e}")
+        return False
 
-async def run_chog(wallet: Dict):
+async def run_chog(wallet: Wallet):
     try:
-        chog = BUY_CHOG(private_key=wallet['private_key'], rpc=monad_rpc, proxy=wallet['proxy'])
+        chog = BUY_CHOG(wallet=wallet, rpc=monad_rpc)
         await chog.response_buy_chog()
-        await update_last_run("chog", wallet['address'])
+        return True
     except Exception as e:
         print(f"[run_chog] Error: {e}")
+        return False
 
-async def run_dak(wallet: Dict):
+async def run_dak(wallet: Wallet):
     try:
-        dak = BUY_DAK(private_key=wallet['private_key'], rpc=monad_rpc, proxy=wallet['proxy'])
+        dak = BUY_DAK(wallet=wallet, rpc=monad_rpc)
         await dak.response_buy_dak()
-        await update_last_run("dak", wallet['address'])
+        return True
     except Exception as e:
         print(f"[run_dak] Error: {e}")
+        return False
 
-async def run_yaki(wallet: Dict):
+async def run_yaki(wallet: Wallet):
     try:
-        yaki = BUY_YAKI(private_key=wallet['private_key'], rpc=monad_rpc,  proxy=wallet['proxy'])
+        yaki = BUY_YAKI(wallet=wallet, rpc=monad_rpc)
         await yaki.response_buy_yaki()
-        await update_last_run("yaki", wallet['address'])
+        return True
     except Exception as e:
         print(f"[run_yaki] Error: {e}")
+        return False
 
-async def run_monorail(wallet: Dict):
+async def run_monorail(wallet: Wallet):
     try:
-        mn = MONORAIL(private_key=wallet['private_key'], rpc=monad_rpc, proxy=wallet.get("proxy"))
-        await mn.monorail_swap()
-        await update_last_run("monorail", wallet['address'])
+        mn = MONORAIL(wallet=wallet, rpc=monad_rpc)
+        return await mn.monorail_swap()
     except Exception as e:
         print(f"[run_monorail] Error: {e}")
+        return False
 
-async def run_nft(wallet: Dict):
+async def run_nft(wallet: Wallet):
     try:
-        minter = LilChogstarsMinter(rpc_url=monad_rpc, private_key=wallet['private_key'], quantity=1)
+        minter = LilChogstarsMinter(rpc_url=monad_rpc, wallet=wallet, quantity=1)
         await minter.lilChogstars_mint()
-        await update_last_run("nft", wallet['address'])
+        return True
     except Exception as e:
         print(f"[run_nft] Error: {e}")
+        return False
 
-async def run_pandaria(wallet: Dict):
+async def run_pandaria(wallet: Wallet):
     try:
-        pand = DepositContract(rpc_url=monad_rpc, private_key=wallet['private_key'])
+        pand = DepositContract(rpc_url=monad_rpc, wallet=wallet)
         await pand.pandaria_wrap()
-        await update_last_run("pandaria", wallet['address'])
+        return True
     except Exception as e:
         print(f"[run_pandaria] Error: {e}")
+        return False
 
 SCRIPT_MAP = {
     "kinza": run_kinza,
@@ -325,6 +311,13 @@ SCRIPT_MAP = {
     "pandaria": run_pandaria,
 }
 
+# transactions each script sends when it runs to the end
+SCRIPT_TX_COUNTS = {
+    "kinza": 2,
+    "magma": 2,
+    "monorail": 2,
+}
+
 DIGIT_MAP = {
     "1": "bean",
     "2": "kinza",
@@ -337,49 +330,126 @@ DIGIT_MAP = {
     "9": "pandaria",
 }
 
-async def auto_route():
-    print(Fore.CYAN + "\n🚀 launching auto route..." + Style.RESET_ALL)
-    delay = await set_custom_delay()  
-    all_wallets = await get_all_wallets()
-    if not all_wallets:
-        print(Fore.RED + "❌ In database not wallets!" + Style.RESET_ALL)
-        return
-    print(f"📊 All wallets in DB: {len(all_wallets)}")
-    tasks = defaultdict(list)
-    skipped_wallets = set() 
-    for wallet in all_wallets:
+async def run_script(script_name: str, wallet: Wallet) -> str:
+    if await proxy_health.is_dead(wallet.proxy):
+        print(Fore.YELLOW + f"⏩ {script_name}: proxy of {wallet.address} is dead, skipped" + Style.RESET_ALL)
+        return "skipped"
+    started_at = now_str()
+    with receipt_tracker.collect() as futures:
+        completed = await SCRIPT_MAP[script_name](wallet)
+    return await record_run(script_name, wallet.address, started_at, completed, futures)
+
+async def run_planned_job(item_id: int, script_name: str, wallet: Wallet, nonce_before: int):
+    status = "failed"
+    try:
         try:
-            checker = AsyncTokenBalanceChecker(rpc_url=monad_rpc, private_key=wallet["private_key"])
-            balance = await checker.get_mon_balance()
-            await update_balance_in_db(wallet["address"], balance)
-            wallet["balance"] = balance
+            started = await route_plan.start_item(item_id, wallet.address, script_name, nonce_before,
+                                                  SCRIPT_TX_COUNTS.get(script_name, 1))
         except Exception as e:
-            print(Fore.RED + f"⚠️ Error receiving balance {wallet['address']}: {e}" + Style.RESET_ALL)
-            wallet["balance"] = 0.0
-        if not wallet.get("proxy") or float(wallet["balance"] )< 0.1:
-            if wallet["address"] not in skipped_wallets:
-                print(Fore.YELLOW + f"⏩ SKIP: {wallet['address']} - not proxy or balance ({wallet['balance']:.6f}) < 0.1" + Style.RESET_ALL)
-                skipped_wallets.add(wallet["address"]) 
-            continue
-        last_runs = {script: wallet.get(f"last_run_{script}") for script in SCRIPT_MAP.keys()}
-        sorted_scripts = sorted(last_runs.items(), key=lambda x: x[1] or "1970-01-01T00:00:00")
-        for script, _ in sorted_scripts:
-            tasks[script].append(wallet)
-    if not tasks:
+            # nothing ran yet, so a failed nonce check hands the item back for a later try
+            print(Fore.YELLOW + f"⚠️ {script_name}: nonce check for {wallet.address} failed ({e}), requeued" + Style.RESET_ALL)
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+            status = "retry"
+            return
+        if started == "done":
+            status = "done"
+        elif started == "requeue":
+            status = "queued"
+        else:
+            status = await run_script(script_name, wallet)
+    finally:
+        await job_queue.complete(item_id, status)
+
+async def resume_or_plan_route() -> int | None:
+    unfinished = await route_plan.unfinished()
+    if unfinished:
+        answer = input(Fore.YELLOW + f"\n⏯️ Route #{unfinished['id']} ({unfinished['mode']}) has "
+                       f"{unfinished['remaining']} tasks left. Resume or join it? (y/n): " + Style.RESET_ALL).strip().lower()
+        if answer == "y":
+            return unfinished["id"]
+        await route_plan.abort_unfinished()
+    total = await count_wallets()
+    if not total:
+        print(Fore.RED + "❌ In database not wallets!" + Style.RESET_ALL)
+        return None
+    print(f"📊 All wallets in DB: {total}")
+    await scan_wallet_balances()
+    await check_proxies()
+    if not await report_skipped_wallets():
         print(Fore.RED + "❌There are no tasks for the auto-route." + Style.RESET_ALL)
+        return None
+    return await route_plan.create(AUTO_ROUTE_MODE, list(SCRIPT_MAP))
+
+def route_jobs(run_id: int):
+    return ((wallet.address, lambda item_id=item_id, script_name=script_name, wallet=wallet, nonce_before=nonce_before:
+             run_planned_job(item_id, script_name, wallet, nonce_before))
+            async for item_id, wallet, script_name, nonce_before in job_queue.iter_jobs(run_id, MAX_WORKERS))
+
+async def run_route_worker(run_id: int, verbose: bool = True):
+    job_queue.start_heartbeat(run_id)
+    try:
+        await AsyncTaskScheduler(verbose=verbose).run(route_jobs(run_id))
+    finally:
+        await job_queue.stop_heartbeat()
+        await job_queue.release(run_id)
+
+async def run_route_process(run_id: int):
+    # every process gets its share of the per-host request rates
+    endpoint_limiter.split(ROUTE_PROCESSES)
+    await chain_info.warm_up(monad_rpc)
+    gas_oracle.start(monad_rpc)
+    try:
+        await run_route_worker(run_id, verbose=False)
+    finally:
+        await gas_oracle.stop()
+        await receipt_tracker.stop()
+        await provider_pool.close()
+        await http_sessions.close()
+        await database.close()
+
+def run_worker_process(run_id: int):
+    # each process owns its event loop, RPC pool, nonce counters and DB writer,
+    # and leases jobs like any other worker, so processes only meet in SQLite
+    asyncio.run(run_route_process(run_id))
+
+async def run_route_processes(run_id: int, processes_count: int):
+    ctx = multiprocessing.get_context("spawn")
+    processes = [ctx.Process(target=run_worker_process, args=(run_id,), daemon=True)
+                 for _ in range(processes_count)]
+    for process in processes:
+        process.start()
+    print(Fore.GREEN + f"🚀 Route #{run_id} running on {processes_count} processes" + Style.RESET_ALL)
+    while any(process.is_alive() for process in processes):
+        await asyncio.sleep(ROUTE_PROGRESS_INTERVAL)
+        counts = await route_plan.counts(run_id)
+        finished = counts.get("done", 0) + counts.get("failed", 0)
+        print(Fore.CYAN + f"📈 Progress: {finished}/{sum(counts.values())} "
+              f"(in flight {counts.get('in_flight', 0)}, failed {counts.get('failed', 0)})" + Style.RESET_ALL)
+    for number, process in enumerate(processes):
+        process.join()
+        if process.exitcode:
+            print(Fore.RED + f"⚠️ Worker {number} exited with code {process.exitcode}, "
+                  "its jobs go back to the queue once their leases expire" + Style.RESET_ALL)
+
+async def auto_route():
+    print(Fore.CYAN + "\n🚀 launching auto route..." + Style.RESET_ALL)
+    run_id = await resume_or_plan_route()
+    if run_id is None:
         return
-    print(f"\n🔄 Total task: {sum(len(wl) for wl in tasks.values())}")
-    for script_name, wallets in tasks.items():
-        runner = SCRIPT_MAP.get(script_name)
-        if not runner:
-            continue
-        print(Fore.GREEN + f"\n🚀 Run {script_name} for {len(wallets)} wallets!" + Style.RESET_ALL)
-        async def do_one_task(wallet):
-            await runner(wallet)
-            await asyncio.sleep(delay)
-        await asyncio.gather(*[do_one_task(wallet) for wallet in wallets])
+    counts = await route_plan.counts(run_id)
+    print(f"\n🔄 Route #{run_id}: {counts.get('queued', 0)} tasks queued, {counts.get('done', 0)} done, {counts.get('failed', 0)} failed")
+    if ROUTE_PROCESSES > 1:
+        await run_route_processes(run_id, ROUTE_PROCESSES)
+    else:
+        await run_route_worker(run_id)
+    await route_plan.finish(run_id)
     print(Fore.GREEN + "✅ Auto route ended." + Style.RESET_ALL)
 
+async def iter_manual_tasks(scripts: List[str]):
+    for script_name in scripts:
+        async for wallet in iter_wallets(MIN_ROUTE_BALANCE, require_proxy=True, healthy_proxy=True):
+            yield script_name, wallet
+
 async def manual_route():
     print(Fore.CYAN + "\n🎛️ launching manual route!" + Style.RESET_ALL)
     print(" 1 --- Bean", "\n",
@@ -396,47 +466,31 @@ async def manual_route():
     if not route_str.isdigit():
         print(Fore.RED + "❌  ERROR: etner only numbers!" + Style.RESET_ALL)
         return
-    all_wallets = await get_all_wallets()
-    if not all_wallets:
+    wallets_count = await count_wallets()
+    if not wallets_count:
         print(Fore.RED + "🚨In database not wallets." + Style.RESET_ALL)
         return
-    print(Fore.GREEN + f"📊 Found {len(all_wallets)} wallets." + Style.RESET_ALL)
-    delay = await set_custom_delay() 
-    skipped_wallets = set()  
-    big_task_list = []
+    print(Fore.GREEN + f"📊 Found {wallets_count} wallets." + Style.RESET_ALL)
+    scripts = []
     for digit in route_str:
         script_name = DIGIT_MAP.get(digit)
         if not script_name:
             continue
-        runner = SCRIPT_MAP.get(script_name)
-        if not runner:
+        if script_name not in SCRIPT_MAP:
             print(Fore.RED + f"⚠️ Script {script_name} not found." + Style.RESET_ALL)
             continue
-        for wallet in all_wallets:
-            try:
-                checker = AsyncTokenBalanceChecker(rpc_url=monad_rpc, private_key=wallet["private_key"])
-                balance = await checker.get_mon_balance()
-                await update_balance_in_db(wallet["address"], balance)
-                wallet["balance"] = balance
-            except Exception as e:
-                print(Fore.RED + f"⚠️ Error recevid balance {wallet['address']}: {e}" + Style.RESET_ALL)
-                wallet["balance"] = 0.0
-            if not wallet.get("proxy") or float(wallet["balance"] )< 0.1:
-                if wallet["address"] not in skipped_wallets:
-                    print(Fore.YELLOW + f"⏩ SKIP: {wallet['address']} - not proxy or balance ({wallet['balance']:.6f}) < 0.1" + Style.RESET_ALL)
-                    skipped_wallets.add(wallet["address"]) 
-                continue
-            big_task_list.append((runner, wallet))
-    if not big_task_list:
+        scripts.append(script_name)
+    await scan_wallet_balances()
+    await check_proxies()
+    eligible = await report_skipped_wallets()
+    total = eligible * len(scripts)
+    if not total:
         print(Fore.RED + "❌  There are no tasks for the manual-route." + Style.RESET_ALL)
         return
-    print(Fore.GREEN + f"\n🚀 Total tasks: {len(big_task_list)}" + Style.RESET_ALL)
+    print(Fore.GREEN + f"\n🚀 Total tasks: {total}" + Style.RESET_ALL)
     idx = 0
-    total = len(big_task_list)
-    async def do_one_task(task):
-        runner, wallet = task
-        await runner(wallet)
-        await asyncio.sleep(delay)
+    tasks = iter_manual_tasks(scripts)
+    scheduler = AsyncTaskScheduler()
     while idx < total:
         left = total - idx
         user_input = input(Fore.YELLOW + f"\n⏳ Fatigue {left} tasks. how many to run in this batch? ('q' for quit) " + Style.RESET_ALL).strip().lower()
@@ -451,31 +505,26 @@ async def manual_route():
         except ValueError:
             print(Fore.RED + "❌ Enter number or 'q'." + Style.RESET_ALL)
             continue
-        chunk = big_task_list[idx: idx + batch_size]
-        await asyncio.gather(*[do_one_task(task) for task in chunk])
+        chunk = []
+        async for script_name, wallet in tasks:
+            chunk.append((wallet.address, lambda script_name=script_name, wallet=wallet: run_script(script_name, wallet)))
+            if len(chunk) >= batch_size:
+                break
+        if not chunk:
+            break
+        await scheduler.run(chunk)
         idx += len(chunk)
         if idx >= total:
             print(Fore.GREEN + "🎉 All tasks completed!" + Style.RESET_ALL)
             break
     print(Fore.GREEN + "✅ Manual route ended." + Style.RESET_ALL)
 
-    
-async def set_custom_delay():
-    while True:
-        try:
-            delay = float(input(Fore.YELLOW + "\n⏳ Enter delay (in seconds, for example 10): " + Style.RESET_ALL).strip())
-            if delay < 0:
-                continue
-            return delay
-        except ValueError:
-            print(Fore.RED + "❌ Enter number in seconds." + Style.RESET_ALL)
 
 async def create_wallets_via_script():
     generate()
     csv_path = "new_addresses.csv"
-    new_wallets = await load_wallets_from_csv(csv_path)
-    if new_wallets:
-        await add_wallets_bulk(new_wallets)
+    if os.path.exists(csv_path):
+        await add_wallets_bulk(iter_wallets_from_csv(csv_path))
     else:
         print("Failed to load wallets from new_addresses.csv.")
 
@@ -488,12 +537,12 @@ async def select_wallet_source():
         choice = input("Выберите (1/2/3): ").strip()
 
         if choice == '1':
-            load_wallets_from_private_keys() 
+            await load_wallets_from_private_keys()
 
         elif choice == "2":
-            list_wallets_data = load_wallets_from_list(wallets)
+            list_wallets_data = await load_wallets_from_list(wallets)
             if list_wallets_data:
-                add_wallets_bulk(list_wallets_data)
+                await add_wallets_bulk(list_wallets_data)
             else:
                 print("List in config.py empty. ")
 
@@ -505,6 +554,9 @@ async def select_wallet_source():
 async def main():
     await init_db()
     await print_banner()
+    await chain_info.warm_up(monad_rpc, arb_rpc)
+    gas_oracle.start(monad_rpc)
+    proxy_health.start()
     while True:
         print("\n--- MAIN MENU ---")
         print("1) Use existing wallets")
@@ -515,9 +567,10 @@ async def main():
         print("6) Clear all wallets")
         print("7) List all wallets")
         print("8) Buy $MON for all")
+        print("9) Check proxies")
         print("0) Exit")
         
-        ans = input("Select (1-8/0): ").strip()
+        ans = input("Select (1-9/0): ").strip()
 
         if ans == "1":
             await select_wallet_source()
@@ -535,10 +588,18 @@ async def main():
             await print_all_wallet_addresses()
         elif ans == '8':
             await buy_monad_for_all_wallets()
+        elif ans == "9":
+            await check_proxies(force=True)
         elif ans == "0":
             break
         else:
             print("❌ Unknowmn choice. Try again")
+    await gas_oracle.stop()
+    await proxy_health.stop()
+    await receipt_tracker.stop()
+    await provider_pool.close()
+    await http_sessions.close()
+    await database.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -1,6 +1,10 @@
 import asyncio
 from web3 import AsyncWeb3
-from web3.providers import AsyncHTTPProvider
+from async_utils.async_provider import get_async_web3
+from async_utils.async_nonce import nonce_manager
+from async_utils.async_wallets import Wallet, as_wallet
+from async_utils.async_chain_info import chain_info
+from async_utils.async_gas_oracle import gas_oracle
 import random
 from async_utils.async_balance_native import AsyncTokenBalanceChecker
 from loguru import logger
@@ -29,14 +33,13 @@ class Kinza:
 
     def __init__(self,
                   rpc_url: str,
-                    private_key: str,
+                    wallet: Wallet | str,
         ):
-        self.web3 = AsyncWeb3(AsyncHTTPProvider(rpc_url))
+        self.wallet = as_wallet(wallet)
+        self.web3 = get_async_web3(rpc_url, self.wallet.proxy_url)
         self.rpc = rpc_url
-        self.private_key = private_key
-        self.wallet_address = self.web3.to_checksum_address(
-            self.web3.eth.account.from_key(private_key).address
-        )
+        self.private_key = self.wallet.private_key
+        self.wallet_address = self.wallet.address
         self.contract_supply = self.web3.eth.contract(
             address=self.web3.to_checksum_address(self.SUPPLY_ADDRESS),
            
@@ -46,13 +49,13 @@ class Kinza:
             address=self.web3.to_checksum_address(self.APPROVE_CONTRACT),
             abi=self.FUNCTION_ABI
         )
-        self.checker = AsyncTokenBalanceChecker(rpc_url=self.rpc, private_key=self.private_key)
+        self.checker = AsyncTokenBalanceChecker(rpc_url=self.rpc, wallet=self.wallet)
         self.value = None
         self.contract_address = self.web3.to_checksum_address("0x590B03D84441c1277f32784d1fbC22Fe18b1eEe0")
 
     
     async def create_supply_input_data(self) -> str:
-        balance = await AsyncTokenBalanceChecker(rpc_url=self.rpc, private_key=self.private_key).get_all_balances()
+        balance = await AsyncTokenBalanceChecker(rpc_url=self.rpc, wallet=self.wallet).get_all_balances()
         value_eth = balance['DAK'] * 0.05
         self.value = value_eth
         value_wei = int(value_eth * (10 ** 18))  
@@ -69,11 +72,10 @@ class Kinza:
     async def infinity_approve(self,
         ):
         spender: str = '0x590B03D84441c1277f32784d1fbC22Fe18b1eEe0'
-        nonce = await self.web3.eth.get_transaction_count(self.wallet_address, "pending")
-        gas_price = self.web3.to_wei(62, "gwei")
+        fees = await gas_oracle.fee_params(self.web3)
         gas_limit: int = 100000
         value: int = 115792089237316195423570985008687907853269984665640564039457584007913129639935
-        chain_id = await self.web3.eth.chain_id
+        chain_id = await chain_info.chain_id(self.web3)
 
         tx = await self.contract_approve.functions.approve(
             AsyncWeb3.to_checksum_address(spender),
@@ -81,12 +83,10 @@ class Kinza:
             "chainId": chain_id,
             "from": self.wallet_address,
             "gas": gas_limit,
-            "gasPrice": gas_price,
-            "nonce": nonce
+            **fees,
         })
 
-        signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
-        tx_hash = await self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        tx_hash = await nonce_manager.send_transaction(self.web3, tx, self.wallet.account, self.wallet_address)
 
     async def create_withdraw_input_data(self,
                                    spender: str,
@@ -102,10 +102,9 @@ class Kinza:
     async def withdraw_liquidity(self):
         try:
             withdraw_spender: str = "0x0F0BDEbF0F83cD1EE3974779Bcb7315f9808c714"
-            nonce = await self.web3.eth.get_transaction_count(self.wallet_address, "pending")
             amount_withdraw = 2**256 - 1 
-            gas_price = await self.web3.eth.gas_price
-            chain_id = await self.web3.eth.chain_id
+            fees = await gas_oracle.fee_params(self.web3)
+            chain_id = await chain_info.chain_id(self.web3)
             input_data = await self.create_withdraw_input_data(withdraw_spender, amount_withdraw)
 
             tx = {
@@ -114,13 +113,11 @@ class Kinza:
                 "to": self.contract_address,
                 "data": input_data,
                 "gas": 300000,
-                "gasPrice": gas_price,
-                "nonce": nonce
+                **fees,
             }
-            signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
-            tx_hash = await self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-            balance_dak = await self.checker.get_all_balances()
-            balance_mon = await self.checker.get_mon_balance()
+            tx_hash = await nonce_manager.send_transaction(self.web3, tx, self.wallet.account, self.wallet_address)
+            balance_dak = await self.checker.get_all_balances(include_mon=True)
+            balance_mon = balance_dak['MON']
             
             logger.success(f"🔄 Succes Withdraw $DAK in KINZA | Wallet {self.wallet_address} |" 
                             f" Balance MON/DAK - {balance_mon}/{balance_dak['DAK']} ")
@@ -130,27 +127,24 @@ class Kinza:
 
     async def Kinza_supply_DAK(self):
         
-        input_data = await self.create_supply_input_data()
-        nonce = await self.web3.eth.get_transaction_count(self.wallet_address, "pending")
-        gas_price = self.web3.to_wei(52, "gwei")
+        input_data, _ = await self.create_supply_input_data()
+        fees = await gas_oracle.fee_params(self.web3)
         gas_limit: int = 300000
-        chain_id = await self.web3.eth.chain_id
+        chain_id = await chain_info.chain_id(self.web3)
 
         tx = {
             "to": AsyncWeb3.to_checksum_address(self.SUPPLY_ADDRESS),
             "value": 0,
             "gas": gas_limit,
-            "gasPrice": gas_price,
-            "nonce": nonce,
+            **fees,
             "data": input_data,
             "chainId": chain_id
         }
 
-        signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
-        tx_hash = await self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        ins = AsyncTokenBalanceChecker(rpc_url=self.rpc, private_key=self.private_key)
-        balance_dak = await ins.get_all_balances()
-        balance_mon = await ins.get_mon_balance()
+        tx_hash = await nonce_manager.send_transaction(self.web3, tx, self.wallet.account, self.wallet_address)
+        ins = AsyncTokenBalanceChecker(rpc_url=self.rpc, wallet=self.wallet)
+        balance_dak = await ins.get_all_balances(include_mon=True)
+        balance_mon = balance_dak['MON']
         
         logger.success(f"🔄 Succes suuply {self.value} $DAK | Wallet {self.wallet_address} |" 
                         f" Balance MON/DAK - {balance_mon}/{balance_dak['DAK']} ")
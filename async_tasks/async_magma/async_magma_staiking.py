@@ -1,7 +1,10 @@
 import asyncio
 import random
-from web3 import AsyncWeb3
-from web3.providers import AsyncHTTPProvider
+from async_utils.async_provider import get_async_web3
+from async_utils.async_nonce import nonce_manager
+from async_utils.async_wallets import Wallet, as_wallet
+from async_utils.async_chain_info import chain_info
+from async_utils.async_gas_oracle import gas_oracle
 from async_utils.async_balance_native import AsyncTokenBalanceChecker
 from loguru import logger
 
@@ -9,21 +12,20 @@ class MAGMA:
 
     def __init__(self,
                   rpc_url: str,
-                    private_key: str,
+                    wallet: Wallet | str,
                       token_decimals: int = 18
         ):
         self.rpc_url = rpc_url
-        self.web3 = AsyncWeb3(AsyncHTTPProvider(rpc_url))
-        self.private_key = private_key
-        self.wallet_address = self.web3.to_checksum_address(
-            self.web3.eth.account.from_key(private_key).address
-        )
+        self.wallet = as_wallet(wallet)
+        self.web3 = get_async_web3(rpc_url, self.wallet.proxy_url)
+        self.private_key = self.wallet.private_key
+        self.wallet_address = self.wallet.address
         self.contract_address = self.web3.to_checksum_address("0x2c9C959516e9AAEdB2C748224a41249202ca8BE7")
         self.stake_function_selector = "0xd5575982"
         self.unstake_function_selector = "0x6fed1ea7"
         self.token_decimals = token_decimals
 
-        self.balance_checker = AsyncTokenBalanceChecker(self.rpc_url, self.private_key)
+        self.balance_checker = AsyncTokenBalanceChecker(self.rpc_url, self.wallet)
 
 
     async def magma_stake_mon(self):
@@ -31,26 +33,22 @@ class MAGMA:
 
         value = self.web3.to_wei(value_eth, "ether")
         gas_limit = 200000
-        gas_price_gwei: int = 62
-        gas_price = self.web3.to_wei(gas_price_gwei, "gwei")
-        nonce = await self.web3.eth.get_transaction_count(self.wallet_address, "pending")
-        chain_id = await self.web3.eth.chain_id
+        fees = await gas_oracle.fee_params(self.web3)
+        chain_id = await chain_info.chain_id(self.web3)
 
         tx = {
             "chainId": chain_id,
-            "nonce": nonce,
             "to": self.contract_address,
             "value": value,
             "gas": gas_limit,
-            "gasPrice": gas_price,
+            **fees,
             "data": self.stake_function_selector,
         }
 
-        signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
-        tx_hash = await self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
-        ins = AsyncTokenBalanceChecker(rpc_url=self.rpc_url, private_key=self.private_key)
-        balance_gMON = await ins.get_all_balances()
-        balance_mon = await ins.get_mon_balance()
+        tx_hash = await nonce_manager.send_transaction(self.web3, tx, self.wallet.account, self.wallet_address)
+        ins = AsyncTokenBalanceChecker(rpc_url=self.rpc_url, wallet=self.wallet)
+        balance_gMON = await ins.get_all_balances(include_mon=True)
+        balance_mon = balance_gMON['MON']
         
         logger.success(f" Wallet {self.wallet_address} |" 
                        f" Balance MON/gMON - {balance_mon}/{balance_gMON['gMON']} ")
@@ -74,26 +72,23 @@ class MAGMA:
             return None
 
         input_data = self.create_unstake_input_data(balance)
-        nonce = await self.web3.eth.get_transaction_count(self.wallet_address, "pending")
-        gas_price_gwei: int = 50
+        fees = await gas_oracle.fee_params(self.web3)
         gas_limit: int = 200000
 
         tx = {
             "to": self.contract_address,
             "value": 0,
             "gas": gas_limit,
-            "gasPrice": self.web3.to_wei(gas_price_gwei, "gwei"),
-            "nonce": nonce,
+            **fees,
             "data": input_data,
-            "chainId": await self.web3.eth.chain_id
+            "chainId": await chain_info.chain_id(self.web3)
         }
 
-        signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
-        tx_hash = await self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        tx_hash = await nonce_manager.send_transaction(self.web3, tx, self.wallet.account, self.wallet_address)
 
-        ins = AsyncTokenBalanceChecker(rpc_url=self.rpc_url, private_key=self.private_key)
-        balance_gMON = await ins.get_all_balances()
-        balance_mon = await ins.get_mon_balance()
+        ins = AsyncTokenBalanceChecker(rpc_url=self.rpc_url, wallet=self.wallet)
+        balance_gMON = await ins.get_all_balances(include_mon=True)
+        balance_mon = balance_gMON['MON']
         
         logger.success(f" Wallet {self.wallet_address} |" 
                        f" Balance MON/gMON - {balance_mon}/{balance_gMON['gMON']} ")
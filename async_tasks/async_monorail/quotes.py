@@ -0,0 +1,86 @@
+import asyncio
+import math
+import time
+from loguru import logger
+
+from config import MONORAIL_QUOTE_TTL, MONORAIL_AMOUNT_DIGITS
+
+
+class MonorailQuotes:
+    # Sits in front of the pathfinder /v1/quote call. Swap amounts are rounded
+    # down to `digits` significant digits so nearby amounts share a bucket, and
+    # quotes are cached per (from, to, amount) for `ttl` seconds, well inside
+    # the quote's 60s deadline. Identical concurrent requests share one call.
+    # A quote is only handed to other wallets when its calldata does not
+    # contain the sender; pairs whose calldata does are fetched per wallet.
+
+    def __init__(self, ttl: float = MONORAIL_QUOTE_TTL, digits: int = MONORAIL_AMOUNT_DIGITS):
+        self.ttl = ttl
+        self.digits = digits
+        self._quotes = {}
+        self._inflight = {}
+        self._sender_bound = set()
+
+    def bucket(self, amount: float) -> float:
+        if amount <= 0:
+            return amount
+        scale = 10 ** (self.digits - 1 - math.floor(math.log10(amount)))
+        return math.floor(amount * scale) / scale
+
+    @staticmethod
+    def mentions(quote: dict, sender: str) -> bool:
+        data = ((quote or {}).get("transaction") or {}).get("data") or ""
+        return sender[2:].lower() in data.lower()
+
+    def cached(self, key: tuple) -> dict | None:
+        entry = self._quotes.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self.ttl:
+            del self._quotes[key]
+            return None
+        return entry[1]
+
+    async def single_flight(self, key: tuple, fetch) -> dict | None:
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(fetch())
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(inflight)
+
+    async def get(self, from_token: str, to_token: str, amount: float, sender: str, fetch) -> dict | None:
+        # fetch(amount) requests a quote for `sender`, through its proxy
+        pair = (from_token.lower(), to_token.lower())
+        key = (*pair, amount)
+        if pair not in self._sender_bound:
+            quote = self.cached(key)
+            if quote is not None:
+                return quote
+
+            async def fetch_shared():
+                return await fetch(amount), sender
+
+            quote, fetched_for = await self.single_flight(key, fetch_shared)
+            if not quote:
+                # another wallet's proxy may be what failed, so try our own
+                if fetched_for == sender:
+                    return None
+            elif not self.mentions(quote, fetched_for):
+                self._quotes[key] = (time.monotonic(), quote)
+                return quote
+            else:
+                # this pair's calldata is tied to the wallet that asked for it
+                if pair not in self._sender_bound:
+                    logger.info(f"Monorail calldata for {pair[0]} -> {pair[1]} names the sender, quoting per wallet")
+                    self._sender_bound.add(pair)
+                if fetched_for == sender:
+                    return quote
+
+        async def fetch_own():
+            return await fetch(amount)
+
+        return await self.single_flight((*key, sender.lower()), fetch_own)
+
+
+monorail_quotes = MonorailQuotes()
@@ -1,50 +1,35 @@
 import asyncio
 import random
 import json
-import aiohttp
 from loguru import logger
-from fake_useragent import UserAgent
-from web3 import AsyncWeb3
-from eth_account import Account
+from async_utils.async_provider import get_async_web3
+from async_utils.async_nonce import nonce_manager
+from async_utils.async_wallets import Wallet, as_wallet
+from async_utils.async_chain_info import chain_info
+from async_utils.async_gas_oracle import gas_oracle
+from async_utils.async_limits import endpoint_limiter
+from async_utils.async_http import http_sessions
 from eth_utils import to_checksum_address
 
 from async_utils.async_balance_native import AsyncTokenBalanceChecker
+from async_tasks.async_monorail.quotes import monorail_quotes
 
 
 
 
 class MONORAIL:
-    def __init__(self, private_key: str, rpc: str, proxy: str | None):
-        self.private_key = private_key
+    def __init__(self, wallet: Wallet | str, rpc: str, proxy: str | None = None):
+        self.wallet = as_wallet(wallet, proxy)
+        self.private_key = self.wallet.private_key
         self.rpc = rpc
-        self.proxy_str = proxy  
+        self.proxy_str = self.wallet.proxy
         
-        self.proxy_url = self._build_proxy_url(self.proxy_str)
+        self.proxy_url = self.wallet.proxy_url
         
-        self.w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(self.rpc))
-        self.address = to_checksum_address(Account.from_key(private_key=self.private_key).address)
+        self.w3 = get_async_web3(self.rpc, self.wallet.proxy_url)
+        self.address = self.wallet.address
         self.value_to_approve = None
-        self.balance_checker = AsyncTokenBalanceChecker(rpc_url=self.rpc, private_key=self.private_key)
-
-    @staticmethod
-    def _build_proxy_url(proxy_str: str) -> str | None:
-        if not proxy_str:
-            return None
-        
-        if not (proxy_str.startswith("http://") or proxy_str.startswith("socks5://")):
-            proxy_str = f"http://{proxy_str}"
-        return proxy_str
-
-    @staticmethod
-    async def test_proxy(proxy_url: str):
-        if not proxy_url:
-            return
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get("https://httpbin.org/ip", proxy=proxy_url, timeout=10) as resp:
-                    text = await resp.text()
-        except Exception as e:
-            logger.error(f"Proxy is not valid: {e}")
+        self.balance_checker = AsyncTokenBalanceChecker(rpc_url=self.rpc, wallet=self.wallet)
 
     @staticmethod
     def generate_random_value(max_value: float) -> float:
@@ -71,21 +56,18 @@ class MONORAIL:
             ]
 
             contract = self.w3.eth.contract(address=contract_address, abi=abi)
-            nonce = await self.w3.eth.get_transaction_count(self.address, 'pending')
-            gas_price = max(await self.w3.eth.gas_price, self.w3.to_wei(50, 'gwei'))
+            fees = await gas_oracle.fee_params(self.w3)
 
             transaction = await contract.functions.approve(
                 spender_address, self.value_to_approve
             ).build_transaction({
-                "chainId": await self.w3.eth.chain_id,
-                "gasPrice": gas_price,
-                "nonce": nonce,
+                "chainId": await chain_info.chain_id(self.w3),
+                **fees,
                 "gas": 80000,
                 "value": 0,
             })
 
-            signed_tx = self.w3.eth.account.sign_transaction(transaction, self.private_key)
-            txn_hash = await self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            txn_hash = await nonce_manager.send_transaction(self.w3, transaction, self.wallet.account, self.address)
             tx_hash = self.w3.to_hex(txn_hash)
 
         except Exception as e:
@@ -112,13 +94,13 @@ class MONORAIL:
             'sender': self.address,
         }
 
-        async with aiohttp.ClientSession() as session:
+        async with endpoint_limiter.slot('https://testnet-pathfinder-v2.monorail.xyz/v1/quote', self.proxy_url):
             try:
-                async with session.get(
+                async with http_sessions.get(
                     'https://testnet-pathfinder-v2.monorail.xyz/v1/quote',
+                    self.proxy_url,
                     params=params,
                     headers=headers,
-                    proxy=self.proxy_url, 
                     timeout=15
                 ) as resp:
 
@@ -145,13 +127,9 @@ class MONORAIL:
         name = random.choice(list(tokens.keys()))
         return name, tokens[name]
 
-    async def monorail_swap(self):
+    async def monorail_swap(self) -> bool:
 
-        ua = UserAgent()
-        user_agent = ua.random
-
-        if self.proxy_url:
-            await self.test_proxy(self.proxy_url)
+        user_agent = await self.wallet.get_user_agent()
 
         from_token_name, from_token_address = self.choice_token()
         to_token_name, to_token_address = self.choice_token()
@@ -159,48 +137,51 @@ class MONORAIL:
         while to_token_name == from_token_name:
             to_token_name, to_token_address = self.choice_token()
 
-        token_balance = await self.balance_checker.get_token_balance(from_token_address)
-        amount_to_swap = self.generate_random_value(token_balance)
-        mon_balance = await self.balance_checker.get_mon_balance()
+        balances = await self.balance_checker.get_all_balances(include_mon=True)
+        token_balance = balances[from_token_name]
+        # bucketed so wallets swapping the same pair can share a cached quote
+        amount_to_swap = monorail_quotes.bucket(self.generate_random_value(token_balance))
+        mon_balance = balances["MON"]
 
         if token_balance <= 0.05 or mon_balance <= 0.05:
             logger.error(f"❌ There is not enough balance ${from_token_name} or $MON to swap. "
                          f"token_balance: {token_balance}, mon_balance: {mon_balance}")
-            return
+            return False
 
     
         await self.approve_token(amount_to_swap, from_token_address)
 
-        resp_json = await self.response(
-            from_token=from_token_address,
-            user_agent=user_agent,
-            amount_to_swap=amount_to_swap,
-            to_token=to_token_address
+        resp_json = await monorail_quotes.get(
+            from_token_address, to_token_address, amount_to_swap, self.address,
+            lambda amount: self.response(
+                from_token=from_token_address,
+                user_agent=user_agent,
+                amount_to_swap=amount,
+                to_token=to_token_address
+            )
         )
 
         if not resp_json:
             logger.error("❌ API is nothing (None). Stop swap.")
-            return
+            return False
 
         transaction_info = resp_json.get('transaction')
 
         try:
             address_to = to_checksum_address('0xC995498c22a012353FAE7eCC701810D673E25794')
             value_int = int(transaction_info["value"], 16)
-            gas_price = max(await self.w3.eth.gas_price, self.w3.to_wei(50, 'gwei'))
+            fees = await gas_oracle.fee_params(self.w3)
 
             tx_params = {
-                "chainId": await self.w3.eth.chain_id,
-                "nonce": await self.w3.eth.get_transaction_count(self.address, 'latest'),
+                "chainId": await chain_info.chain_id(self.w3),
                 "to": address_to,
                 "data": transaction_info["data"],
                 "value": value_int,
-                "gasPrice": gas_price,
-                "gas": 400000
+                "gas": 400000,
+                **fees
             }
 
-            signed_tx = self.w3.eth.account.sign_transaction(tx_params, self.private_key)
-            txn_hash = await self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            txn_hash = await nonce_manager.send_transaction(self.w3, tx_params, self.wallet.account, self.address)
             tx_hash = self.w3.to_hex(txn_hash)
 
             balance = await self.balance_checker.get_all_balances()
@@ -211,6 +192,8 @@ class MONORAIL:
                 f"Balance {to_token_name}/{from_token_name} "
                 f"- {round(balance[to_token_name], 5)}/{round(balance[from_token_name], 5)}"
             )
+            return True
 
         except Exception as e:
-            logger.error(f"Error swap Monorail: {e} | Wallet {self.address}")
\ No newline at end of file
+            logger.error(f"Error swap Monorail: {e} | Wallet {self.address}")
+            return False
\ No newline at end of file
@@ -1,6 +1,9 @@
 import asyncio
-from web3 import AsyncWeb3
-from web3.providers import AsyncHTTPProvider
+from async_utils.async_provider import get_async_web3
+from async_utils.async_nonce import nonce_manager
+from async_utils.async_wallets import Wallet, as_wallet
+from async_utils.async_chain_info import chain_info
+from async_utils.async_gas_oracle import gas_oracle
 from async_utils.async_balance_native import AsyncTokenBalanceChecker
 from loguru import logger
 
@@ -22,16 +25,15 @@ class LilChogstarsMinter:
 
     def __init__(self,
                   rpc_url: str,
-                    private_key: str,
+                    wallet: Wallet | str,
                     quantity: int,
         ):
-        self.web3 = AsyncWeb3(AsyncHTTPProvider(rpc_url))
-        self.private_key = private_key
+        self.wallet = as_wallet(wallet)
+        self.web3 = get_async_web3(rpc_url, self.wallet.proxy_url)
+        self.private_key = self.wallet.private_key
         self.quantity = quantity
         self.contract_address = "0xb33D7138c53e516871977094B249C8f2ab89a4F4"
-        self.wallet_address = self.web3.to_checksum_address(
-            self.web3.eth.account.from_key(private_key).address
-        )
+        self.wallet_address = self.wallet.address
         self.contract = self.web3.eth.contract(
             address=self.web3.to_checksum_address(self.contract_address),
             abi=self.FUNCTION_ABI
@@ -40,10 +42,8 @@ class LilChogstarsMinter:
     async def lilChogstars_mint(self):
        try:
             gas_limit: int = 200000
-            gas_price_gwei: int = 62
-            nonce = await self.web3.eth.get_transaction_count(self.wallet_address, "pending")
-            gas_price = self.web3.to_wei(gas_price_gwei, "gwei")
-            chain_id = await self.web3.eth.chain_id
+            fees = await gas_oracle.fee_params(self.web3)
+            chain_id = await chain_info.chain_id(self.web3)
             mint_price_eth: float = 0.0
             mint_value = self.web3.to_wei(mint_price_eth, "ether") 
 
@@ -54,12 +54,10 @@ class LilChogstarsMinter:
                 "from": self.wallet_address,
                 "value": mint_value, 
                 "gas": gas_limit,
-                "gasPrice": gas_price,
-                "nonce": nonce
+                **fees,
             })
 
-            signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
-            tx_hash = await self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            tx_hash = await nonce_manager.send_transaction(self.web3, tx, self.wallet.account, self.wallet_address)
             logger.success(f'Success mint LilChogstars | Wallet {self.wallet_address}')
        except Exception as e:
             logger.error(f'Error in mint Lilchogstars | Wallet {self.wallet_address} | {e}')
\ No newline at end of file
@@ -1,6 +1,9 @@
 import asyncio
-from web3 import AsyncWeb3
-from web3.providers import AsyncHTTPProvider
+from async_utils.async_provider import get_async_web3
+from async_utils.async_nonce import nonce_manager
+from async_utils.async_wallets import Wallet, as_wallet
+from async_utils.async_chain_info import chain_info
+from async_utils.async_gas_oracle import gas_oracle
 from async_utils.async_balance_native import AsyncTokenBalanceChecker
 import random
 from loguru import logger
@@ -20,13 +23,12 @@ class DepositContract:
     
     def __init__(self,
                   rpc_url: str,
-                    private_key: str
+                    wallet: Wallet | str
         ):
-        self.web3 = AsyncWeb3(AsyncHTTPProvider(rpc_url))
-        self.private_key = private_key
-        self.wallet_address = self.web3.to_checksum_address(
-            self.web3.eth.account.from_key(private_key).address
-        )
+        self.wallet = as_wallet(wallet)
+        self.web3 = get_async_web3(rpc_url, self.wallet.proxy_url)
+        self.private_key = self.wallet.private_key
+        self.wallet_address = self.wallet.address
         self.contract_address = "0x760AfE86e5de5fa0Ee542fc7B7B713e1c5425701"
         self.contract = self.web3.eth.contract(
             address=self.web3.to_checksum_address(self.contract_address),
@@ -40,12 +42,10 @@ class DepositContract:
     async def pandaria_wrap(self):
        try:
             gas_limit: int = 100000
-            gas_price_gwei: int = 62
             value_eth = self.generate_random_value()
             value = self.web3.to_wei(value_eth, "ether")
-            gas_price = self.web3.to_wei(gas_price_gwei, "gwei")
-            nonce = await self.web3.eth.get_transaction_count(self.wallet_address, "pending")
-            chain_id = await self.web3.eth.chain_id
+            fees = await gas_oracle.fee_params(self.web3)
+            chain_id = await chain_info.chain_id(self.web3)
 
             
             tx = await self.contract.functions.deposit().build_transaction({
@@ -53,14 +53,11 @@ class DepositContract:
                 "from": self.wallet_address,
                 "value": value,
                 "gas": gas_limit,
-                "gasPrice": gas_price,
-                "nonce": nonce
+                **fees,
             })
 
 
-            signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
-
-            tx_hash = await self.web3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            tx_hash = await nonce_manager.send_transaction(self.web3, tx, self.wallet.account, self.wallet_address)
             logger.success(f'Success Pandaria Wrap | Wallet {self.wallet_address}')
        except Exception as e:
             logger.error(f'Error in Pandaria Wrap | Wallet {self.wallet_address} | {e}')
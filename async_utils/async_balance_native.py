@@ -1,6 +1,9 @@
 import asyncio
 from web3 import AsyncWeb3
-from web3.providers import AsyncHTTPProvider
+from loguru import logger
+from async_utils.async_provider import get_async_web3
+from async_utils.async_multicall import AsyncMulticallBalanceReader, token_decimals
+from async_utils.async_wallets import Wallet, as_wallet
 import sys
 import os
 
@@ -8,12 +11,14 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.
 
 class AsyncTokenBalanceChecker:
 
-    def __init__(self, rpc_url: str, private_key: str):
-        self.w3 = AsyncWeb3(AsyncHTTPProvider(rpc_url))
-        self.private_key = private_key
-        self.wallet_address = AsyncWeb3.to_checksum_address(
-            self.w3.eth.account.from_key(private_key).address
-        )
+    def __init__(self, rpc_url: str, wallet: Wallet | str, use_multicall: bool = True):
+        self.rpc_url = rpc_url
+        self.wallet = as_wallet(wallet)
+        self.w3 = get_async_web3(rpc_url, self.wallet.proxy_url)
+        self.use_multicall = use_multicall
+        self.multicall_reader = AsyncMulticallBalanceReader(rpc_url, proxy=self.wallet.proxy_url)
+        self.private_key = self.wallet.private_key
+        self.wallet_address = self.wallet.address
 
         self.tokens = {
             "CHOG": "0xE0590015A873bF326bd645c3E1266d4db41C4E6B",
@@ -55,11 +60,24 @@ class AsyncTokenBalanceChecker:
         )
 
         balance = await token_contract.functions.balanceOf(self.wallet_address).call()
-        decimals = await token_contract.functions.decimals().call()
+        key = (self.rpc_url, token_contract.address)
+        if key not in token_decimals:
+            token_decimals[key] = await token_contract.functions.decimals().call()
+        decimals = token_decimals[key]
         readable_balance = balance / (10 ** decimals)
         return round(readable_balance, 6)
 
-    async def get_all_balances(self) -> dict:
+    async def get_all_balances(self, include_mon: bool = False) -> dict:
+        if self.use_multicall and await self.multicall_reader.is_available():
+            try:
+                balances = await self.multicall_reader.get_balances([self.wallet_address], self.tokens)
+                balances = balances[self.wallet_address]
+                if not include_mon:
+                    balances.pop("MON")
+                return balances
+            except Exception as e:
+                logger.warning(f"Multicall balances failed, falling back to per-call reads: {e}")
+
         balances = {}
 
         async def fetch_balance(token_name, token_address):
@@ -68,6 +86,8 @@ class AsyncTokenBalanceChecker:
 
         tasks = [fetch_balance(name, address) for name, address in self.tokens.items()]
         await asyncio.gather(*tasks)
+        if include_mon:
+            balances["MON"] = await self.get_mon_balance()
         return balances
     
     async def get_mon_balance(self) -> float:
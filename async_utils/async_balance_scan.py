@@ -0,0 +1,56 @@
+import asyncio
+from web3 import AsyncWeb3
+from loguru import logger
+
+from async_utils.async_provider import get_async_web3
+from async_utils.async_multicall import AsyncMulticallBalanceReader
+from config import BALANCE_SCAN_CONCURRENCY, BALANCE_SCAN_BATCH_SIZE
+
+
+class AsyncBalanceScanner:
+
+    def __init__(self,
+                  rpc_url: str,
+                    concurrency: int = BALANCE_SCAN_CONCURRENCY,
+                      batch_size: int = BALANCE_SCAN_BATCH_SIZE
+        ):
+        self.w3 = get_async_web3(rpc_url)
+        self.reader = AsyncMulticallBalanceReader(rpc_url)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.batch_size = batch_size
+
+    async def scan(self, addresses: list) -> dict:
+        use_multicall = await self.reader.is_available()
+        chunks = [addresses[i:i + self.batch_size] for i in range(0, len(addresses), self.batch_size)]
+        balances = {}
+        for result in await asyncio.gather(*[self.scan_chunk(chunk, use_multicall) for chunk in chunks]):
+            balances.update(result)
+        return balances
+
+    async def scan_chunk(self, addresses: list, use_multicall: bool) -> dict:
+        async with self.semaphore:
+            try:
+                if use_multicall:
+                    result = await self.reader.get_balances(addresses, {})
+                    return {address: data["MON"] for address, data in zip(addresses, result.values())}
+                return await self.batch_get_balance(addresses)
+            except Exception as e:
+                # failed wallets are left out so their stored balance is kept
+                logger.error(f"⚠️ Error receiving balances for {len(addresses)} wallets: {e}")
+                return {}
+
+    async def batch_get_balance(self, addresses: list) -> dict:
+        # w3.batch_requests() toggles batching on the shared provider, so post the
+        # batch straight through the provider instead
+        responses = await self.w3.provider.make_batch_request(
+            [("eth_getBalance", [AsyncWeb3.to_checksum_address(address), "latest"]) for address in addresses]
+        )
+        if not isinstance(responses, list):
+            raise ValueError(responses.get("error", responses))
+        balances = {}
+        for address, response in zip(addresses, responses):
+            if "result" not in response:
+                logger.error(f"⚠️ Error receiving balance {address}: {response.get('error')}")
+                continue
+            balances[address] = round(int(response["result"], 16) / 10 ** 18, 6)
+        return balances
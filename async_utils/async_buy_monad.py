@@ -1,19 +1,23 @@
-import asyncio
-import aiohttp
-from web3 import AsyncWeb3
-from eth_account import Account
+from async_utils.async_provider import get_async_web3
+from async_utils.async_nonce import nonce_manager
+from async_utils.async_wallets import Wallet, as_wallet
+from async_utils.async_chain_info import chain_info
+from async_utils.async_gas_oracle import gas_oracle
+from async_utils.async_limits import endpoint_limiter
+from async_utils.async_http import http_sessions
 from loguru import logger
 from eth_utils import to_checksum_address
 
 from async_utils.async_balance_native import AsyncTokenBalanceChecker
 
 class AsyncGasZipBuyMonad:
-    def __init__(self, rpc: str, private_key: str):
-        self.w3 = AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(rpc))
-        self.private_key = private_key
-        self.account = Account.from_key(private_key)
-        self.from_address = to_checksum_address(self.account.address)
-        self.checker = AsyncTokenBalanceChecker(rpc_url=rpc, private_key=private_key)
+    def __init__(self, rpc: str, wallet: Wallet | str):
+        self.wallet = as_wallet(wallet)
+        self.w3 = get_async_web3(rpc, self.wallet.proxy_url)
+        self.private_key = self.wallet.private_key
+        self.account = self.wallet.account
+        self.from_address = self.wallet.address
+        self.checker = AsyncTokenBalanceChecker(rpc_url=rpc, wallet=self.wallet)
 
     async def get_eth_price(self) -> float:
         url = "https://api.coingecko.com/api/v3/simple/price"
@@ -21,13 +25,12 @@ class AsyncGasZipBuyMonad:
             'ids': 'ethereum',
             'vs_currencies': 'usd'
         }
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params) as resp:
-                if resp.status != 200:
-                    logger.error(f"Error at receipt ETH/USD, статус {resp.status}")
-                    return 0.0
-                data = await resp.json()
-                return data['ethereum']['usd']
+        async with endpoint_limiter.slot(url), http_sessions.get(url, params=params) as resp:
+            if resp.status != 200:
+                logger.error(f"Error at receipt ETH/USD, статус {resp.status}")
+                return 0.0
+            data = await resp.json()
+            return data['ethereum']['usd']
 
     async def calculate_eth_for_dollars(self, dollars: float) -> float:
         eth_price = await self.get_eth_price()
@@ -48,13 +51,12 @@ class AsyncGasZipBuyMonad:
             'to': self.from_address,
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params=params, headers=headers) as resp:
-                if resp.status != 200:
-                    logger.error(f"Error at receipt quotes GasZip, status {resp.status}")
-                    return ""
-                data = await resp.json()
-                return data.get('calldata', "")
+        async with endpoint_limiter.slot(url), http_sessions.get(url, params=params, headers=headers) as resp:
+            if resp.status != 200:
+                logger.error(f"Error at receipt quotes GasZip, status {resp.status}")
+                return ""
+            data = await resp.json()
+            return data.get('calldata', "")
 
     async def buy_monad_on_GasZip(self, dollars: float = 2):
         to_address = to_checksum_address("0x391E7C679d29bD940d63be94AD22A25d25b5A604")
@@ -62,23 +64,19 @@ class AsyncGasZipBuyMonad:
         value_eth = await self.calculate_eth_for_dollars(dollars)
         value_wei = self.w3.to_wei(value_eth, 'ether')
 
-        nonce = await self.w3.eth.get_transaction_count(self.from_address)
-
         input_data = await self.input_data(value_wei)
 
         tx = {
-            'nonce': nonce,
             'to': to_address,
             'value': value_wei,
             'gas': 47000,
-            'gasPrice': self.w3.to_wei(0.01, 'gwei'),
+            **await gas_oracle.fee_params(self.w3),
             'data': input_data,
-            'chainId': await self.w3.eth.chain_id
+            'chainId': await chain_info.chain_id(self.w3)
         }
 
-        signed_tx = self.w3.eth.account.sign_transaction(tx, self.private_key)
         try:
-            tx_hash_bytes = await self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            tx_hash_bytes = await nonce_manager.send_transaction(self.w3, tx, self.wallet.account, self.from_address)
             tx_hash_hex = self.w3.to_hex(tx_hash_bytes)
         except Exception as e:
             logger.error(f"Error at response GasZip: {e}")
@@ -0,0 +1,35 @@
+from loguru import logger
+
+from async_utils.async_provider import get_async_web3
+
+
+class AsyncChainInfo:
+    # Network facts that never change for an endpoint, fetched once per RPC URL
+    # and shared by every task class.
+
+    def __init__(self):
+        self._chain_ids = {}
+        self._contracts = {}
+
+    async def chain_id(self, w3) -> int:
+        key = w3.provider.endpoint_uri
+        if key not in self._chain_ids:
+            self._chain_ids[key] = await w3.eth.chain_id
+        return self._chain_ids[key]
+
+    async def is_contract(self, w3, address: str) -> bool:
+        key = (w3.provider.endpoint_uri, address)
+        if key not in self._contracts:
+            code = await w3.eth.get_code(address)
+            self._contracts[key] = len(code) > 0
+        return self._contracts[key]
+
+    async def warm_up(self, *rpc_urls: str):
+        for rpc_url in rpc_urls:
+            try:
+                await self.chain_id(get_async_web3(rpc_url))
+            except Exception as e:
+                logger.warning(f"Could not read chain id from {rpc_url}: {e}")
+
+
+chain_info = AsyncChainInfo()
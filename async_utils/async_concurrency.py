@@ -0,0 +1,94 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from loguru import logger
+
+from config import (MAX_WORKERS, CONCURRENCY_MIN, CONCURRENCY_MAX, CONCURRENCY_TARGET_P95,
+                    CONCURRENCY_MAX_ERROR_RATE, CONCURRENCY_ADJUST_INTERVAL, CONCURRENCY_BACKOFF)
+
+
+class AdaptiveConcurrency:
+    # AIMD window for in-flight scheduler jobs, fed by RPC request outcomes.
+    # Every `interval` seconds the window grows by one while p95 latency and the
+    # error rate stay under target and the window was full at some point, so it
+    # does not drift up while idle; a 429, a timeout or an unhealthy interval
+    # multiplies it by `backoff` (at most once per interval).
+
+    def __init__(self,
+                  initial: int = MAX_WORKERS,
+                    minimum: int = CONCURRENCY_MIN,
+                      maximum: int = CONCURRENCY_MAX,
+                        target_p95: float = CONCURRENCY_TARGET_P95,
+                          max_error_rate: float = CONCURRENCY_MAX_ERROR_RATE,
+                            interval: float = CONCURRENCY_ADJUST_INTERVAL,
+                              backoff: float = CONCURRENCY_BACKOFF
+        ):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.window = float(min(max(initial, minimum), maximum))
+        self.target_p95 = target_p95
+        self.max_error_rate = max_error_rate
+        self.interval = interval
+        self.backoff = backoff
+        self.in_flight = 0
+        self._saturated = False
+        self._latencies = []
+        self._errors = 0
+        self._throttled = 0
+        self._started = time.monotonic()
+        self._last_backoff = 0.0
+        self._condition = None
+
+    @property
+    def limit(self) -> int:
+        return max(self.minimum, int(self.window))
+
+    @asynccontextmanager
+    async def slot(self):
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+            if self.in_flight >= self.limit:
+                self._saturated = True
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+
+    def observe(self, latency: float, error: bool = False, throttled: bool = False):
+        self._latencies.append(latency)
+        self._errors += error or throttled
+        self._throttled += throttled
+        now = time.monotonic()
+        if throttled or now - self._started >= self.interval:
+            self.adjust(now)
+
+    def adjust(self, now: float):
+        samples = sorted(self._latencies)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))] if samples else 0.0
+        error_rate = self._errors / len(samples) if samples else 0.0
+        limit = self.limit
+        if self._throttled or error_rate > self.max_error_rate or p95 > self.target_p95:
+            if now - self._last_backoff >= self.interval:
+                self.window = max(self.minimum, self.window * self.backoff)
+                self._last_backoff = now
+                logger.info(f"Concurrency window {limit} -> {self.limit} "
+                            f"(p95 {p95:.2f}s, errors {error_rate:.0%}, throttled {self._throttled})")
+        elif samples and self._saturated:
+            self.window = min(self.maximum, self.window + 1)
+        self._latencies, self._errors, self._throttled = [], 0, 0
+        self._saturated = self.in_flight >= self.limit
+        self._started = now
+        if self.limit > limit and self._condition is not None:
+            asyncio.ensure_future(self.wake())
+
+    async def wake(self):
+        async with self._condition:
+            self._condition.notify_all()
+
+
+concurrency = AdaptiveConcurrency()
@@ -0,0 +1,158 @@
+import asyncio
+import queue
+import sqlite3
+import threading
+from loguru import logger
+
+from config import DB_NAME, DB_WRITE_BATCH, WALLET_PAGE_SIZE
+
+
+class AsyncDatabase:
+    # One WAL-mode connection owned by a dedicated thread. Coroutines queue
+    # statements and await a future; the thread drains the queue in batches and
+    # commits each batch once, so the event loop never touches sqlite itself.
+    # Statements run in queue order, so a read always sees earlier writes.
+
+    def __init__(self, db_name: str = DB_NAME, batch_size: int = DB_WRITE_BATCH):
+        self.db_name = db_name
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self.writer, name="sqlite-writer", daemon=True)
+                self._thread.start()
+
+    async def submit(self, kind: str, sql: str, params=()):
+        self.start()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put((kind, sql, params, loop, future))
+        return await future
+
+    async def execute(self, sql: str, params=()) -> int:
+        return await self.submit("execute", sql, params)
+
+    async def executemany(self, sql: str, rows) -> int:
+        return await self.submit("executemany", sql, list(rows))
+
+    async def fetchall(self, sql: str, params=()) -> list:
+        return await self.submit("fetchall", sql, params)
+
+    async def fetchone(self, sql: str, params=()):
+        return await self.submit("fetchone", sql, params)
+
+    async def call(self, fn):
+        # runs fn(conn) on the writer thread, e.g. schema migrations
+        return await self.submit("call", fn)
+
+    async def iterate(self, sql: str, params=(), size: int = WALLET_PAGE_SIZE):
+        # streams a query through fetchmany on a separate read connection; WAL
+        # lets it read alongside the writer without holding the whole result
+        await self.call(lambda conn: None)
+        conn = await asyncio.to_thread(self.connect)
+        try:
+            cur = await asyncio.to_thread(conn.execute, sql, params)
+            while True:
+                rows = await asyncio.to_thread(cur.fetchmany, size)
+                if not rows:
+                    return
+                for row in rows:
+                    yield row
+        finally:
+            conn.close()
+
+    def connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_name, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def writer(self):
+        conn = self.connect()
+        batch = []
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                stop = any(item is None for item in batch)
+                items = [item for item in batch if item is not None]
+                results = [self.run(conn, item) for item in items]
+                try:
+                    conn.commit()
+                except sqlite3.Error as e:
+                    logger.error(f"SQLite commit failed: {e}")
+                    conn.rollback()
+                    results = [(None, e) for _ in items]
+
+                for item, (result, error) in zip(items, results):
+                    self.notify(item, result, error)
+                batch = []
+                if stop:
+                    return
+        except Exception as e:
+            logger.error(f"SQLite writer stopped: {e}")
+            # fail whatever was taken off the queue or is still waiting on it
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            for item in batch:
+                if item is not None:
+                    self.notify(item, None, e)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def run(conn: sqlite3.Connection, item: tuple) -> tuple:
+        kind, sql, params, _, _ = item
+        try:
+            if kind == "call":
+                return sql(conn), None
+            if kind == "executemany":
+                return conn.executemany(sql, params).rowcount, None
+            cur = conn.execute(sql, params)
+            if kind == "fetchall":
+                return cur.fetchall(), None
+            if kind == "fetchone":
+                return cur.fetchone(), None
+            return cur.rowcount, None
+        except Exception as e:
+            return None, e
+
+    def notify(self, item: tuple, result, error):
+        _, _, _, loop, future = item
+        try:
+            loop.call_soon_threadsafe(self.resolve, future, result, error)
+        except RuntimeError:
+            # the caller's loop is already closed, nobody is waiting
+            pass
+
+    @staticmethod
+    def resolve(future: asyncio.Future, result, error):
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    async def close(self):
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            await asyncio.to_thread(self._thread.join)
+        self._thread = None
+
+
+database = AsyncDatabase()
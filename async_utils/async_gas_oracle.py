@@ -0,0 +1,75 @@
+import asyncio
+import time
+from loguru import logger
+
+from async_utils.async_provider import get_async_web3
+from async_utils.async_chain_info import chain_info
+from sync_utils.gas_policy import legacy_fee_params, eip1559_fee_params
+from config import GAS_ORACLE_TTL, GAS_POLICIES, DEFAULT_GAS_POLICY
+
+
+class AsyncGasOracle:
+    # Serves fee fields for transactions from a per-endpoint cache that is
+    # refreshed at most once per `ttl` seconds (or by a background poller), shaped
+    # by the per-chain policy in config.GAS_POLICIES.
+
+    def __init__(self, ttl: float = GAS_ORACLE_TTL, policies: dict = GAS_POLICIES):
+        self.ttl = ttl
+        self.policies = policies
+        self._fees = {}
+        self._refreshing = {}
+        self._pollers = []
+
+    async def policy(self, w3) -> dict:
+        return {**DEFAULT_GAS_POLICY, **self.policies.get(await chain_info.chain_id(w3), {})}
+
+    async def fee_params(self, w3) -> dict:
+        key = w3.provider.endpoint_uri
+        cached = self._fees.get(key)
+        if cached and time.monotonic() - cached[0] < self.ttl:
+            return dict(cached[1])
+
+        # single-flight: concurrent callers share one refresh per endpoint
+        refreshing = self._refreshing.get(key)
+        if refreshing is None:
+            refreshing = asyncio.ensure_future(self.refresh(w3))
+            self._refreshing[key] = refreshing
+            refreshing.add_done_callback(lambda _: self._refreshing.pop(key, None))
+        return dict(await asyncio.shield(refreshing))
+
+    async def refresh(self, w3) -> dict:
+        policy = await self.policy(w3)
+        if policy["type"] == "eip1559":
+            fees = await self.eip1559_fees(w3, policy)
+        else:
+            fees = await self.legacy_fees(w3, policy)
+        self._fees[w3.provider.endpoint_uri] = (time.monotonic(), fees)
+        return fees
+
+    async def legacy_fees(self, w3, policy: dict) -> dict:
+        return legacy_fee_params(await w3.eth.gas_price, policy)
+
+    async def eip1559_fees(self, w3, policy: dict) -> dict:
+        history = await w3.eth.fee_history(policy["history_blocks"], "latest", [policy["reward_percentile"]])
+        return eip1559_fee_params(history, policy)
+
+    def start(self, *rpc_urls: str, interval: float = None):
+        for rpc_url in rpc_urls:
+            self._pollers.append(asyncio.ensure_future(self.poll(get_async_web3(rpc_url), interval or self.ttl / 2)))
+
+    async def poll(self, w3, interval: float):
+        while True:
+            try:
+                await self.refresh(w3)
+            except Exception as e:
+                logger.warning(f"Gas oracle refresh failed for {w3.provider.endpoint_uri}: {e}")
+            await asyncio.sleep(interval)
+
+    async def stop(self):
+        for poller in self._pollers:
+            poller.cancel()
+        await asyncio.gather(*self._pollers, return_exceptions=True)
+        self._pollers.clear()
+
+
+gas_oracle = AsyncGasOracle()
@@ -0,0 +1,77 @@
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+import aiohttp
+
+from config import HTTP_POOL_MAX_SESSIONS, HTTP_POOL_IDLE_TIMEOUT, HTTP_POOL_LIMIT_PER_HOST
+
+
+class AsyncSessionPool:
+    # Keep-alive ClientSessions for the dApp HTTP APIs, one per (proxy, host), so
+    # repeated calls through the same proxy reuse their connections. At most
+    # `max_sessions` are kept; the least recently used idle ones are closed
+    # first, and sessions idle for `idle_timeout` seconds are closed on the
+    # next lookup. Sessions in use are never closed under a request.
+
+    def __init__(self,
+                  max_sessions: int = HTTP_POOL_MAX_SESSIONS,
+                    idle_timeout: float = HTTP_POOL_IDLE_TIMEOUT,
+                      limit_per_host: int = HTTP_POOL_LIMIT_PER_HOST
+        ):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.limit_per_host = limit_per_host
+        # (proxy, host) -> [session, users, last_used]
+        self._sessions = OrderedDict()
+
+    def acquire(self, url: str, proxy: str = None) -> list:
+        key = (proxy, urlparse(url).hostname)
+        entry = self._sessions.get(key)
+        if entry is None or entry[0].closed:
+            connector = aiohttp.TCPConnector(limit_per_host=self.limit_per_host, ttl_dns_cache=300)
+            entry = [aiohttp.ClientSession(connector=connector), 0, 0.0]
+            self._sessions[key] = entry
+        self._sessions.move_to_end(key)
+        entry[1] += 1
+        self.evict()
+        return entry
+
+    def release(self, entry: list):
+        entry[1] -= 1
+        entry[2] = time.monotonic()
+
+    def evict(self):
+        now = time.monotonic()
+        excess = len(self._sessions) - self.max_sessions
+        for key, (session, users, last_used) in list(self._sessions.items()):
+            if users:
+                continue
+            if excess > 0 or now - last_used >= self.idle_timeout:
+                del self._sessions[key]
+                asyncio.ensure_future(session.close())
+                excess -= 1
+
+    @asynccontextmanager
+    async def request(self, method: str, url: str, proxy: str = None, **kwargs):
+        entry = self.acquire(url, proxy)
+        try:
+            async with entry[0].request(method, url, proxy=proxy, **kwargs) as response:
+                yield response
+        finally:
+            self.release(entry)
+
+    def get(self, url: str, proxy: str = None, **kwargs):
+        return self.request("GET", url, proxy, **kwargs)
+
+    def post(self, url: str, proxy: str = None, **kwargs):
+        return self.request("POST", url, proxy, **kwargs)
+
+    async def close(self):
+        sessions = [session for session, _, _ in self._sessions.values()]
+        self._sessions.clear()
+        await asyncio.gather(*[session.close() for session in sessions if not session.closed])
+
+
+http_sessions = AsyncSessionPool()
@@ -0,0 +1,188 @@
+import asyncio
+import os
+import socket
+import time
+from loguru import logger
+
+from async_utils.async_db import database
+from async_utils.async_wallets import Wallet
+from async_utils.async_route_plan import now_str
+from config import JOB_LEASE_SECONDS, JOB_HEARTBEAT_INTERVAL, JOB_POLL_INTERVAL
+
+CLAIM_SQL = """
+    UPDATE route_items SET status = 'in_flight', lease_owner = ?, lease_expires = ?, updated_at = ?
+    WHERE id = (
+        SELECT i.id FROM route_items i
+        WHERE i.run_id = ? AND i.status = 'queued' AND NOT EXISTS (
+            SELECT 1 FROM route_items o
+            WHERE o.run_id = i.run_id AND o.address = i.address AND o.status = 'in_flight'
+        ) AND (
+            (SELECT mode FROM route_runs WHERE id = ?) != 'script'
+            OR i.script = (
+                SELECT s.script FROM route_items s
+                WHERE s.run_id = ? AND s.status IN ('queued', 'in_flight')
+                ORDER BY s.id LIMIT 1
+            )
+        )
+        ORDER BY i.id LIMIT 1
+    )
+    RETURNING id, address, script, nonce_before
+"""
+
+
+class AsyncJobQueue:
+    # Hands out route_items to any number of workers, in this process, other
+    # processes or other async_main.py instances on the same wallets.db. A
+    # worker claims an item under a lease, renews it from a heartbeat task and
+    # finalizes it when done. A wallet never has more than one leased item, so
+    # two workers can't run scripts on it at once; items of a worker that
+    # stopped renewing go back to the queue once the lease expires. In script
+    # mode only the earliest unfinished script is handed out, so every wallet
+    # finishes one script before any wallet starts the next.
+
+    def __init__(self,
+                  db=database,
+                    lease_seconds: float = JOB_LEASE_SECONDS,
+                      heartbeat_interval: float = JOB_HEARTBEAT_INTERVAL,
+                        poll_interval: float = JOB_POLL_INTERVAL
+        ):
+        self.db = db
+        self.lease_seconds = lease_seconds
+        self.heartbeat_interval = heartbeat_interval
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._heartbeat = None
+        self._completed = asyncio.Event()
+
+    async def claim(self, run_id: int, limit: int) -> list:
+        def claim_items(conn):
+            # commit whatever the writer batched so far, then take the write
+            # lock up front so concurrent claimers queue on busy_timeout
+            conn.commit()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()
+                expired = conn.execute("""
+                    UPDATE route_items SET status = 'queued', lease_owner = NULL, lease_expires = NULL
+                    WHERE run_id = ? AND status = 'in_flight' AND lease_expires < ?
+                    RETURNING address, script
+                """, (run_id, now)).fetchall()
+                for row in expired:
+                    logger.warning(f"Lease on {row['script']} for {row['address']} expired, requeued")
+                items = []
+                for _ in range(limit):
+                    row = conn.execute(CLAIM_SQL, (
+                        self.worker_id, now + self.lease_seconds, now_str(), run_id, run_id, run_id
+                    )).fetchone()
+                    if row is None:
+                        break
+                    items.append(dict(row))
+                if items:
+                    addresses = list({item["address"] for item in items})
+                    rows = conn.execute(f"""
+                        SELECT address, private_key, proxy, balance FROM wallets
+                        WHERE address IN ({", ".join("?" for _ in addresses)})
+                    """, addresses).fetchall()
+                    wallets = {row["address"]: Wallet.from_row(row) for row in rows}
+                    for item in items:
+                        item["wallet"] = wallets.get(item["address"])
+                conn.commit()
+                return items
+            except Exception:
+                conn.rollback()
+                raise
+
+        return await self.db.call(claim_items)
+
+    async def has_pending(self, run_id: int) -> bool:
+        row = await self.db.fetchone(
+            "SELECT EXISTS (SELECT 1 FROM route_items WHERE run_id = ? AND status IN ('queued', 'in_flight'))",
+            (run_id,)
+        )
+        return bool(row[0])
+
+    async def iter_jobs(self, run_id: int, batch: int):
+        # yields (item_id, Wallet, script, nonce_before) until the route is
+        # drained; items leased by other workers are waited out, not skipped
+        while True:
+            self._completed.clear()
+            items = await self.claim(run_id, batch)
+            if not items:
+                if not await self.has_pending(run_id):
+                    return
+                await self.wait_for_completion()
+                continue
+            for item in items:
+                if item["wallet"] is None:
+                    # wallet deleted since the plan was made
+                    await self.complete(item["id"], "failed")
+                    continue
+                yield item["id"], item["wallet"], item["script"], item["nonce_before"]
+
+    async def wait_for_completion(self):
+        # a finished item frees its wallet, so claim again as soon as one of
+        # ours completes; other workers' items are still picked up by polling
+        try:
+            await asyncio.wait_for(self._completed.wait(), self.poll_interval)
+        except asyncio.TimeoutError:
+            pass
+
+    async def complete(self, item_id: int, status: str) -> bool:
+        if status == "queued":
+            # back to the queue as a fresh item, the next claimer runs it again
+            updated = await self.db.execute("""
+                UPDATE route_items SET status = 'queued', nonce_before = NULL, lease_owner = NULL,
+                    lease_expires = NULL, updated_at = ?
+                WHERE id = ? AND status = 'in_flight' AND lease_owner = ?
+            """, (now_str(), item_id, self.worker_id))
+        elif status == "retry":
+            # not started yet, back to the queue as it was; nonce_before is kept
+            # so the next claimer still checks what an earlier attempt sent
+            updated = await self.db.execute("""
+                UPDATE route_items SET status = 'queued', lease_owner = NULL, lease_expires = NULL, updated_at = ?
+                WHERE id = ? AND status = 'in_flight' AND lease_owner = ?
+            """, (now_str(), item_id, self.worker_id))
+        else:
+            updated = await self.db.execute("""
+                UPDATE route_items SET status = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ?
+                WHERE id = ? AND status = 'in_flight' AND lease_owner = ?
+            """, ("done" if status in ("success", "done") else "failed", now_str(), item_id, self.worker_id))
+        self._completed.set()
+        if not updated:
+            logger.warning(f"Route item {item_id} finished after its lease was lost")
+        return bool(updated)
+
+    async def release(self, run_id: int):
+        # hand unfinished leases back right away instead of waiting for expiry;
+        # started items keep nonce_before, so the next claimer checks the nonce
+        await self.db.execute("""
+            UPDATE route_items SET status = 'queued', lease_owner = NULL, lease_expires = NULL
+            WHERE run_id = ? AND status = 'in_flight' AND lease_owner = ?
+        """, (run_id, self.worker_id))
+
+    def start_heartbeat(self, run_id: int):
+        if self._heartbeat is None or self._heartbeat.done():
+            self._heartbeat = asyncio.ensure_future(self.heartbeat(run_id))
+
+    async def heartbeat(self, run_id: int):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self.db.execute("""
+                    UPDATE route_items SET lease_expires = ?
+                    WHERE run_id = ? AND status = 'in_flight' AND lease_owner = ?
+                """, (time.time() + self.lease_seconds, run_id, self.worker_id))
+            except Exception as e:
+                logger.warning(f"Lease heartbeat failed: {e}")
+
+    async def stop_heartbeat(self):
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            try:
+                await self._heartbeat
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat = None
+
+
+job_queue = AsyncJobQueue()
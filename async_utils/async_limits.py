@@ -0,0 +1,139 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+from config import (ENDPOINT_CONCURRENCY, ENDPOINT_RATE_LIMITS, PROXY_RATE_LIMIT,
+                    RPC_PROXY_RATE_LIMIT, RPC_PROXY_CONCURRENCY, RPC_PROXY_LIMITERS_MAX)
+
+
+class TokenBucket:
+    # Refills `rate` tokens per second up to `burst`. Waiters are served in
+    # arrival order, so a crowd of callers is spread out instead of retried.
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def refill(self) -> float:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        return self.tokens
+
+    async def acquire(self):
+        async with self._lock:
+            while self.refill() < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+            self.tokens -= 1
+
+
+class EndpointLimiter:
+    # Rate limits (token buckets) and caps in-flight requests per host, plus an
+    # optional bucket per (host, proxy). Hosts missing from the maps are unlimited.
+    # RPC calls sent through a proxy also pass a per-proxy bucket and semaphore
+    # on top of the host-wide ones; idle proxy limiters are dropped once there
+    # are more than `max_proxies` of them.
+    # Buckets are per process; split() divides the rates between route processes.
+
+    def __init__(self,
+                  limits: dict = ENDPOINT_CONCURRENCY,
+                    rates: dict = ENDPOINT_RATE_LIMITS,
+                      proxy_rate: dict = PROXY_RATE_LIMIT,
+                        rpc_proxy_rate: dict = RPC_PROXY_RATE_LIMIT,
+                          rpc_proxy_limit: int = RPC_PROXY_CONCURRENCY,
+                            max_proxies: int = RPC_PROXY_LIMITERS_MAX
+        ):
+        self.limits = limits
+        self.rates = rates
+        self.proxy_rate = proxy_rate
+        self.rpc_proxy_rate = rpc_proxy_rate
+        self.rpc_proxy_limit = rpc_proxy_limit
+        self.max_proxies = max_proxies
+        self.processes = 1
+        self._semaphores = {}
+        self._buckets = {}
+        # proxy -> [bucket, semaphore, users]
+        self._proxies = {}
+
+    def split(self, processes: int):
+        self.processes = max(processes, 1)
+        self._buckets.clear()
+        self._proxies.clear()
+
+    def semaphore(self, host: str):
+        if host not in self.limits:
+            return None
+        if host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.limits[host])
+        return self._semaphores[host]
+
+    def new_bucket(self, rate: dict):
+        if rate is None:
+            return None
+        return TokenBucket(rate["rps"] / self.processes, rate["burst"] / self.processes)
+
+    def bucket(self, key, rate: dict):
+        if rate is None:
+            return None
+        if key not in self._buckets:
+            self.prune(self._buckets, lambda bucket: bucket.refill() >= bucket.burst)
+            self._buckets[key] = self.new_bucket(rate)
+        return self._buckets[key]
+
+    def prune(self, limiters: dict, idle):
+        if len(limiters) < self.max_proxies:
+            return
+        for key in [key for key, value in limiters.items() if idle(value)]:
+            del limiters[key]
+
+    async def throttle(self, host: str, proxy: str = None):
+        bucket = self.bucket(host, self.rates.get(host))
+        if bucket is not None:
+            await bucket.acquire()
+        if proxy:
+            bucket = self.bucket((host, proxy), self.proxy_rate)
+            if bucket is not None:
+                await bucket.acquire()
+
+    @asynccontextmanager
+    async def slot(self, url: str, proxy: str = None):
+        host = urlparse(url).hostname
+        await self.throttle(host, proxy)
+        semaphore = self.semaphore(host)
+        if semaphore is None:
+            yield
+            return
+        async with semaphore:
+            yield
+
+    @asynccontextmanager
+    async def rpc_slot(self, url: str, proxy: str = None):
+        # the proxy's own share first, so a busy proxy never sits on a host-wide slot
+        if not proxy:
+            async with self.slot(url):
+                yield
+            return
+        entry = self._proxies.get(proxy)
+        if entry is None:
+            self.prune(self._proxies, lambda entry: not entry[2])
+            entry = [self.new_bucket(self.rpc_proxy_rate),
+                     asyncio.Semaphore(self.rpc_proxy_limit) if self.rpc_proxy_limit else None, 0]
+            self._proxies[proxy] = entry
+        entry[2] += 1
+        try:
+            if entry[0] is not None:
+                await entry[0].acquire()
+            if entry[1] is None:
+                async with self.slot(url):
+                    yield
+                return
+            async with entry[1], self.slot(url):
+                yield
+        finally:
+            entry[2] -= 1
+
+endpoint_limiter = EndpointLimiter()
@@ -0,0 +1,137 @@
+from web3 import AsyncWeb3
+from loguru import logger
+
+from async_utils.async_provider import get_async_web3
+from async_utils.async_chain_info import chain_info
+
+MULTICALL3_ADDRESS = AsyncWeb3.to_checksum_address("0xcA11bde05977b3631167028862bE2a173976CA11")
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"}
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"}
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    },
+    {
+        "inputs": [{"internalType": "address", "name": "addr", "type": "address"}],
+        "name": "getEthBalance",
+        "outputs": [{"internalType": "uint256", "name": "balance", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function"
+    }
+]
+
+ERC20_BALANCE_ABI = [
+    {
+        "constant": True,
+        "inputs": [{"name": "_owner", "type": "address"}],
+        "name": "balanceOf",
+        "outputs": [{"name": "balance", "type": "uint256"}],
+        "type": "function",
+    },
+    {
+        "constant": True,
+        "inputs": [],
+        "name": "decimals",
+        "outputs": [{"name": "", "type": "uint8"}],
+        "type": "function",
+    },
+]
+
+# token decimals never change, so they are read once per (rpc, token)
+token_decimals = {}
+missing_multicall_warned = set()
+
+
+class AsyncMulticallBalanceReader:
+
+    def __init__(self,
+                  rpc_url: str,
+                    multicall_address: str = MULTICALL3_ADDRESS,
+                      max_calls: int = 500,
+                        proxy: str | None = None
+        ):
+        self.rpc_url = rpc_url
+        self.w3 = get_async_web3(rpc_url, proxy)
+        self.multicall_address = AsyncWeb3.to_checksum_address(multicall_address)
+        self.multicall = self.w3.eth.contract(address=self.multicall_address, abi=MULTICALL3_ABI)
+        self.erc20 = self.w3.eth.contract(abi=ERC20_BALANCE_ABI)
+        self.max_calls = max_calls
+
+    async def is_available(self) -> bool:
+        try:
+            deployed = await chain_info.is_contract(self.w3, self.multicall_address)
+        except Exception as e:
+            logger.warning(f"Multicall3 lookup failed on {self.rpc_url}: {e}")
+            return False
+        if not deployed and self.rpc_url not in missing_multicall_warned:
+            missing_multicall_warned.add(self.rpc_url)
+            logger.warning(f"Multicall3 is not deployed on {self.rpc_url}, using per-call balances")
+        return deployed
+
+    async def aggregate(self, calls: list) -> list:
+        results = []
+        for i in range(0, len(calls), self.max_calls):
+            chunk = calls[i:i + self.max_calls]
+            results.extend(await self.multicall.functions.aggregate3(chunk).call())
+        return results
+
+    async def load_decimals(self, token_addresses: list):
+        missing = [t for t in token_addresses if (self.rpc_url, t) not in token_decimals]
+        if not missing:
+            return
+        calls = [(t, True, self.erc20.encode_abi("decimals")) for t in missing]
+        for token, (success, data) in zip(missing, await self.aggregate(calls)):
+            token_decimals[(self.rpc_url, token)] = int.from_bytes(data, "big") if success and data else 18
+
+    async def get_balances(self, addresses: list, tokens: dict) -> dict:
+        addresses = [AsyncWeb3.to_checksum_address(a) for a in addresses]
+        token_items = [(name, AsyncWeb3.to_checksum_address(addr)) for name, addr in tokens.items()]
+        await self.load_decimals([addr for _, addr in token_items])
+
+        calls = []
+        for address in addresses:
+            calls.append((self.multicall_address, True, self.multicall.encode_abi("getEthBalance", args=[address])))
+            for _, token_address in token_items:
+                calls.append((token_address, True, self.erc20.encode_abi("balanceOf", args=[address])))
+
+        results = iter(await self.aggregate(calls))
+        balances = {}
+        for address in addresses:
+            success, data = next(results)
+            wallet_balances = {"MON": round(self.decode_uint(success, data) / 10 ** 18, 6)}
+            for name, token_address in token_items:
+                success, data = next(results)
+                decimals = token_decimals[(self.rpc_url, token_address)]
+                wallet_balances[name] = round(self.decode_uint(success, data) / (10 ** decimals), 6)
+            balances[address] = wallet_balances
+        return balances
+
+    @staticmethod
+    def decode_uint(success: bool, data: bytes) -> int:
+        if not success or not data:
+            return 0
+        return int.from_bytes(data[:32], "big")
@@ -0,0 +1,102 @@
+import threading
+from eth_account import Account
+from loguru import logger
+
+from async_utils.async_receipt_tracker import receipt_tracker
+
+NONCE_ERRORS = (
+    "nonce too low",
+    "invalid nonce",
+    "replacement transaction underpriced",
+    "nonce has already been used",
+)
+
+
+def is_already_known(error: Exception) -> bool:
+    # the node already has this exact signed tx in its mempool
+    return "already known" in str(error).lower()
+
+
+def is_nonce_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return any(text in message for text in NONCE_ERRORS)
+
+
+class AsyncNonceManager:
+    # Syncs each address from the chain once and then hands out nonces locally.
+    # The dict is guarded by a threading lock, so allocation stays atomic for
+    # coroutines on one loop as well as for loops running in other threads.
+
+    def __init__(self):
+        self._nonces = {}
+        self._mutex = threading.Lock()
+
+    @staticmethod
+    def key(w3, address: str) -> tuple:
+        return w3.provider.endpoint_uri, address.lower()
+
+    async def next_nonce(self, w3, address: str) -> int:
+        key = self.key(w3, address)
+        with self._mutex:
+            if key in self._nonces:
+                nonce = self._nonces[key]
+                self._nonces[key] += 1
+                return nonce
+        chain_nonce = await w3.eth.get_transaction_count(address, "pending")
+        with self._mutex:
+            # another coroutine may have synced while we were waiting; keep its counter
+            nonce = self._nonces.setdefault(key, chain_nonce)
+            self._nonces[key] += 1
+            return nonce
+
+    async def resync(self, w3, address: str) -> int:
+        chain_nonce = await w3.eth.get_transaction_count(address, "pending")
+        self.seed(w3, address, chain_nonce)
+        return chain_nonce
+
+    def seed(self, w3, address: str, nonce: int):
+        # the wallet may have sent from another process since we last synced
+        with self._mutex:
+            self._nonces[self.key(w3, address)] = nonce
+
+    def reset(self, w3, address: str):
+        with self._mutex:
+            self._nonces.pop(self.key(w3, address), None)
+
+    async def send_transaction(self, w3, tx: dict, signer, address: str = None):
+        # signer is a LocalAccount (preferred, no re-derivation) or a raw private key
+        if isinstance(signer, str):
+            signer = Account.from_key(signer)
+        address = address or tx.get("from") or signer.address
+        for attempt in range(2):
+            tx["nonce"] = await self.next_nonce(w3, address)
+            signed_tx = signer.sign_transaction(tx)
+            try:
+                tx_hash = await w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+            except Exception as e:
+                if is_already_known(e):
+                    # resigning would broadcast a second, different tx; track this one
+                    self.track(w3, signed_tx.hash, address)
+                    return signed_tx.hash
+                if attempt == 0 and is_nonce_error(e):
+                    logger.warning(f"Nonce {tx['nonce']} rejected for {address}, resyncing: {e}")
+                    await self.resync(w3, address)
+                    continue
+                # the allocated nonce was never used; make the next send refetch it
+                self.reset(w3, address)
+                raise
+            self.track(w3, tx_hash, address)
+            return tx_hash
+
+    def track(self, w3, tx_hash, address: str):
+        receipt = receipt_tracker.track(w3, w3.to_hex(tx_hash), address)
+
+        def on_receipt(future):
+            # a dropped tx leaves a gap in the local counter; refetch on next send
+            if not future.cancelled() and future.result()["status"] is None:
+                self.reset(w3, address)
+
+        receipt.add_done_callback(on_receipt)
+
+
+nonce_manager = AsyncNonceManager()
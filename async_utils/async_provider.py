@@ -0,0 +1,120 @@
+import asyncio
+import time
+import aiohttp
+from web3 import AsyncWeb3
+from web3.providers import AsyncHTTPProvider
+from web3._utils.http_session_manager import HTTPSessionManager
+
+from async_utils.async_rpc_batcher import AsyncRpcBatcher
+from async_utils.async_limits import endpoint_limiter
+from async_utils.async_concurrency import concurrency
+from config import (RPC_POOL_LIMIT, RPC_POOL_LIMIT_PER_HOST, RPC_KEEPALIVE_TIMEOUT,
+                    RPC_BATCH_ENABLED, RPC_BATCH_WINDOW, RPC_BATCH_MAX_SIZE,
+                    RPC_THROUGH_PROXY, RPC_PROXY_POOL_LIMIT)
+
+
+class PooledSessionManager(HTTPSessionManager):
+    # web3 opens a force_close ClientSession per provider instance; hand it the
+    # pool's keep-alive session instead so every provider on the same proxy (or
+    # on none) shares one connector.
+    def __init__(self, pool: "AsyncProviderPool", proxy: str = None):
+        super().__init__()
+        self.pool = pool
+        self.proxy = proxy
+
+    async def async_cache_and_return_session(self, endpoint_uri, session=None, request_timeout=None):
+        return await self.pool.get_session(self.proxy)
+
+    async def async_make_post_request(self, endpoint_uri, data, **kwargs):
+        async with endpoint_limiter.rpc_slot(endpoint_uri, self.proxy):
+            started = time.monotonic()
+            try:
+                response = await super().async_make_post_request(endpoint_uri, data, **kwargs)
+            except asyncio.TimeoutError:
+                concurrency.observe(time.monotonic() - started, throttled=True)
+                raise
+            except aiohttp.ClientResponseError as e:
+                concurrency.observe(time.monotonic() - started, error=True, throttled=e.status == 429)
+                raise
+            except aiohttp.ClientError:
+                concurrency.observe(time.monotonic() - started, error=True)
+                raise
+            concurrency.observe(time.monotonic() - started)
+            return response
+
+
+class PooledAsyncHTTPProvider(AsyncHTTPProvider):
+
+    def __init__(self, endpoint_uri: str, pool: "AsyncProviderPool", proxy: str = None,
+                 batch: bool = RPC_BATCH_ENABLED, **kwargs):
+        if proxy:
+            kwargs["request_kwargs"] = {**kwargs.get("request_kwargs", {}), "proxy": proxy}
+        super().__init__(endpoint_uri, **kwargs)
+        self._request_session_manager = PooledSessionManager(pool, proxy)
+        self.batcher = AsyncRpcBatcher(self, RPC_BATCH_WINDOW, RPC_BATCH_MAX_SIZE) if batch else None
+
+    async def make_request(self, method, params):
+        if self.batcher is None:
+            return await super().make_request(method, params)
+        return await self.batcher.request(method, params)
+
+    async def make_unbatched_request(self, method, params):
+        return await super().make_request(method, params)
+
+
+class AsyncProviderPool:
+
+    def __init__(self,
+                  limit: int = RPC_POOL_LIMIT,
+                    limit_per_host: int = RPC_POOL_LIMIT_PER_HOST,
+                      keepalive_timeout: float = RPC_KEEPALIVE_TIMEOUT,
+                        proxy_limit: int = RPC_PROXY_POOL_LIMIT
+        ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.proxy_limit = proxy_limit
+        # keyed by (rpc_url, proxy) and proxy; None is the direct connection
+        self._web3 = {}
+        self._sessions = {}
+        self._lock = asyncio.Lock()
+
+    def get_web3(self, rpc_url: str, proxy: str = None) -> AsyncWeb3:
+        w3 = self._web3.get((rpc_url, proxy))
+        if w3 is None:
+            w3 = AsyncWeb3(PooledAsyncHTTPProvider(rpc_url, pool=self, proxy=proxy))
+            self._web3[(rpc_url, proxy)] = w3
+        return w3
+
+    async def get_session(self, proxy: str = None) -> aiohttp.ClientSession:
+        session = self._sessions.get(proxy)
+        if session is not None and not session.closed:
+            return session
+        async with self._lock:
+            session = self._sessions.get(proxy)
+            if session is None or session.closed:
+                # a proxy is one exit IP, so its pool gets the smaller limit
+                limit = self.proxy_limit if proxy else self.limit
+                connector = aiohttp.TCPConnector(
+                    limit=limit,
+                    limit_per_host=min(limit, self.limit_per_host),
+                    keepalive_timeout=self.keepalive_timeout,
+                    ttl_dns_cache=300,
+                )
+                session = aiohttp.ClientSession(connector=connector, raise_for_status=True)
+                self._sessions[proxy] = session
+        return session
+
+    async def close(self):
+        sessions = [session for session in self._sessions.values() if not session.closed]
+        self._sessions.clear()
+        self._web3.clear()
+        await asyncio.gather(*[session.close() for session in sessions])
+
+
+provider_pool = AsyncProviderPool()
+
+
+def get_async_web3(rpc_url: str, proxy: str = None) -> AsyncWeb3:
+    # task classes pass their wallet's proxy; it is only used with RPC_THROUGH_PROXY
+    return provider_pool.get_web3(rpc_url, proxy if RPC_THROUGH_PROXY else None)
@@ -0,0 +1,130 @@
+import asyncio
+import datetime
+import os
+import time
+import aiohttp
+from loguru import logger
+
+from async_utils.async_db import database
+from async_utils.async_http import http_sessions
+from async_utils.async_wallets import proxy_url
+from async_utils.async_route_plan import now_str
+from config import (PROXY_FILE, PROXY_CHECK_URL, PROXY_CHECK_TIMEOUT, PROXY_CHECK_CONCURRENCY, PROXY_CHECK_TTL,
+                    PROXY_SLOW_LATENCY, PROXY_MAX_FAILURES, PROXY_HEALTH_CACHE_TTL)
+
+UPSERT_OK_SQL = """
+    INSERT INTO proxy_health (proxy, latency, last_ok, checked_at, failures) VALUES (?, ?, ?, ?, 0)
+    ON CONFLICT (proxy) DO UPDATE SET
+        latency = excluded.latency, last_ok = excluded.last_ok, checked_at = excluded.checked_at, failures = 0
+"""
+
+UPSERT_FAILED_SQL = """
+    INSERT INTO proxy_health (proxy, latency, checked_at, failures) VALUES (?, ?, ?, 1)
+    ON CONFLICT (proxy) DO UPDATE SET
+        latency = excluded.latency, checked_at = excluded.checked_at, failures = proxy_health.failures + 1
+"""
+
+
+class AsyncProxyHealth:
+    # Probes the proxies of proxy.txt and the wallets table concurrently and
+    # keeps latency, last success and consecutive failures in proxy_health.
+    # Proxies checked within `ttl` are not probed again. Tasks only look the
+    # proxy up in a dead set cached for `cache_ttl` seconds, never probe it.
+
+    def __init__(self,
+                  check_url: str = PROXY_CHECK_URL,
+                    timeout: float = PROXY_CHECK_TIMEOUT,
+                      concurrency: int = PROXY_CHECK_CONCURRENCY,
+                        ttl: float = PROXY_CHECK_TTL,
+                          slow_latency: float = PROXY_SLOW_LATENCY,
+                            max_failures: int = PROXY_MAX_FAILURES,
+                              cache_ttl: float = PROXY_HEALTH_CACHE_TTL
+        ):
+        self.check_url = check_url
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.ttl = ttl
+        self.slow_latency = slow_latency
+        self.max_failures = max_failures
+        self.cache_ttl = cache_ttl
+        self._dead = set()
+        self._loaded = None
+        self._poller = None
+
+    async def proxies(self) -> list:
+        rows = await database.fetchall("SELECT DISTINCT proxy FROM wallets WHERE proxy IS NOT NULL AND proxy != ''")
+        proxies = {row[0] for row in rows}
+        if os.path.exists(PROXY_FILE):
+            with open(PROXY_FILE, "r", encoding="utf-8") as f:
+                proxies.update(line.strip() for line in f if line.strip())
+        return sorted(proxies)
+
+    async def probe(self, proxy: str) -> float | None:
+        started = time.monotonic()
+        try:
+            async with http_sessions.get(self.check_url, proxy_url(proxy),
+                                         timeout=aiohttp.ClientTimeout(total=self.timeout)) as resp:
+                await resp.read()
+                if resp.status != 200:
+                    return None
+        except Exception:
+            return None
+        return time.monotonic() - started
+
+    async def check(self, force: bool = False) -> dict:
+        proxies = await self.proxies()
+        if not force:
+            cutoff = (datetime.datetime.now() - datetime.timedelta(seconds=self.ttl)).isoformat(sep=' ', timespec='seconds')
+            rows = await database.fetchall("SELECT proxy FROM proxy_health WHERE checked_at >= ?", (cutoff,))
+            fresh = {row[0] for row in rows}
+            proxies = [proxy for proxy in proxies if proxy not in fresh]
+        if not proxies:
+            return {"checked": 0, "ok": 0, "failed": 0}
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def probe(proxy):
+            async with semaphore:
+                return proxy, await self.probe(proxy)
+
+        results = await asyncio.gather(*[probe(proxy) for proxy in proxies])
+        now = now_str()
+        ok = [(proxy, latency, now, now) for proxy, latency in results
+              if latency is not None and latency <= self.slow_latency]
+        failed = [(proxy, latency, now) for proxy, latency in results
+                  if latency is None or latency > self.slow_latency]
+        await database.executemany(UPSERT_OK_SQL, ok)
+        await database.executemany(UPSERT_FAILED_SQL, failed)
+        self._loaded = None
+        logger.info(f"Checked {len(results)} proxies: {len(ok)} ok, {len(failed)} failed or slow")
+        return {"checked": len(results), "ok": len(ok), "failed": len(failed)}
+
+    async def dead(self) -> set:
+        if self._loaded is None or time.monotonic() - self._loaded >= self.cache_ttl:
+            rows = await database.fetchall("SELECT proxy FROM proxy_health WHERE failures >= ?", (self.max_failures,))
+            self._dead = {row[0] for row in rows}
+            self._loaded = time.monotonic()
+        return self._dead
+
+    async def is_dead(self, proxy: str) -> bool:
+        return bool(proxy) and proxy in await self.dead()
+
+    def start(self, interval: float = None):
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.ensure_future(self.poll(interval or self.ttl))
+
+    async def poll(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.warning(f"Proxy health check failed: {e}")
+
+    async def stop(self):
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+
+
+proxy_health = AsyncProxyHealth()
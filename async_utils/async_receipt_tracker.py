@@ -0,0 +1,156 @@
+import asyncio
+import contextvars
+import time
+from contextlib import contextmanager
+import datetime
+from loguru import logger
+
+from async_utils.async_db import database
+from async_utils.async_provider import get_async_web3
+from config import RECEIPT_POLL_INTERVAL, RECEIPT_BATCH_SIZE, RECEIPT_TIMEOUT
+
+
+class AsyncReceiptTracker:
+    # One background loop polls receipts for every submitted tx in JSON-RPC
+    # batches and resolves a future per tx, so tasks never run their own polling.
+    # collect() gathers the futures of txs sent inside it (in the same task),
+    # so a run waits for its own transactions and nothing else.
+
+    def __init__(self,
+                  poll_interval: float = RECEIPT_POLL_INTERVAL,
+                    batch_size: int = RECEIPT_BATCH_SIZE,
+                      timeout: float = RECEIPT_TIMEOUT
+        ):
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._pending = {}
+        self._collector = contextvars.ContextVar("receipt_collector", default=None)
+        self._unbatched = set()
+        self._task = None
+
+    def track(self, w3, tx_hash: str, address: str) -> asyncio.Future:
+        if tx_hash in self._pending:
+            return self._pending[tx_hash][2]
+        future = asyncio.get_running_loop().create_future()
+        self._pending[tx_hash] = (w3, address, future, time.monotonic())
+        collected = self._collector.get()
+        if collected is not None:
+            collected.append(future)
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self.run())
+        return future
+
+    @contextmanager
+    def collect(self):
+        futures = []
+        token = self._collector.set(futures)
+        try:
+            yield futures
+        finally:
+            self._collector.reset(token)
+
+    async def wait(self, futures: list) -> list:
+        return list(await asyncio.gather(*futures))
+
+    async def run(self):
+        while self._pending:
+            await asyncio.sleep(self.poll_interval)
+            finished = []
+            try:
+                finished.extend(await self.poll())
+            except Exception as e:
+                logger.warning(f"Receipt polling failed: {e}")
+            finished.extend(self.expire())
+            if finished:
+                try:
+                    await self.record(finished)
+                except Exception as e:
+                    logger.error(f"Could not record receipts: {e}")
+
+    async def poll(self) -> list:
+        by_endpoint = {}
+        for tx_hash, (w3, _, _, _) in list(self._pending.items()):
+            by_endpoint.setdefault(w3.provider.endpoint_uri, []).append(tx_hash)
+
+        finished = []
+        for endpoint_uri, hashes in by_endpoint.items():
+            # receipts are public, so poll on the direct provider rather than
+            # through whichever wallet's proxy sent the tx
+            w3 = get_async_web3(endpoint_uri)
+            try:
+                finished.extend(await self.poll_endpoint(w3, hashes))
+            except Exception as e:
+                logger.warning(f"Receipt polling failed for {endpoint_uri}: {e}")
+        return finished
+
+    async def poll_endpoint(self, w3, hashes: list) -> list:
+        finished = []
+        for i in range(0, len(hashes), self.batch_size):
+            chunk = hashes[i:i + self.batch_size]
+            responses = await self.fetch_receipts(w3, chunk)
+            for tx_hash, response in zip(chunk, responses):
+                receipt = (response or {}).get("result")
+                if receipt and tx_hash in self._pending:
+                    finished.append(self.resolve(tx_hash, {
+                        "tx_hash": tx_hash,
+                        "status": int(receipt["status"], 16),
+                        "block_number": int(receipt["blockNumber"], 16),
+                        "gas_used": int(receipt["gasUsed"], 16),
+                    }))
+        return finished
+
+    async def fetch_receipts(self, w3, chunk: list) -> list:
+        endpoint_uri = w3.provider.endpoint_uri
+        if endpoint_uri not in self._unbatched:
+            responses = await w3.provider.make_batch_request(
+                [("eth_getTransactionReceipt", [tx_hash]) for tx_hash in chunk]
+            )
+            if isinstance(responses, list) and len(responses) == len(chunk):
+                return responses
+            # the endpoint rejected the batch as a whole; poll it one by one from now on
+            logger.warning(f"RPC {endpoint_uri} does not accept batches, polling receipts one by one")
+            self._unbatched.add(endpoint_uri)
+        return await asyncio.gather(*[self.fetch_receipt(w3, tx_hash) for tx_hash in chunk])
+
+    async def fetch_receipt(self, w3, tx_hash: str) -> dict | None:
+        try:
+            return await w3.provider.make_unbatched_request("eth_getTransactionReceipt", [tx_hash])
+        except Exception as e:
+            logger.warning(f"Receipt poll for {tx_hash} failed: {e}")
+            return None
+
+    def expire(self) -> list:
+        finished = []
+        now = time.monotonic()
+        for tx_hash, (_, address, _, submitted_at) in list(self._pending.items()):
+            if now - submitted_at > self.timeout:
+                logger.error(f"🚨 Tx {tx_hash} was not mined in {self.timeout}s | Wallet {address}")
+                finished.append(self.resolve(tx_hash, {
+                    "tx_hash": tx_hash, "status": None, "block_number": None, "gas_used": None
+                }))
+        return finished
+
+    def resolve(self, tx_hash: str, receipt: dict) -> tuple:
+        _, address, future, _ = self._pending.pop(tx_hash)
+        if receipt["status"] == 0:
+            logger.error(f"🚨 Tx {tx_hash} reverted in block {receipt['block_number']} | Wallet {address}")
+        if not future.done():
+            future.set_result(receipt)
+        return (tx_hash, address, receipt["status"], receipt["block_number"], receipt["gas_used"],
+                datetime.datetime.now().isoformat(sep=' ', timespec='seconds'))
+
+    async def record(self, rows: list):
+        await database.executemany("""
+            INSERT OR REPLACE INTO tx_receipts (tx_hash, address, status, block_number, gas_used, confirmed_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, rows)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+receipt_tracker = AsyncReceiptTracker()
@@ -0,0 +1,98 @@
+import datetime
+from loguru import logger
+
+from async_utils.async_db import database
+from async_utils.async_provider import get_async_web3
+from async_utils.async_nonce import nonce_manager
+from async_utils.async_wallets import wallet_filter
+from sync_utils.db_schema import least_recent_runs_query, RECORD_RUN_SQL
+from config import monad_rpc, MIN_ROUTE_BALANCE
+
+
+def now_str() -> str:
+    return datetime.datetime.now().isoformat(sep=' ', timespec='seconds')
+
+
+class AsyncRoutePlan:
+    # Persists every (wallet, script) item of an auto route before it starts,
+    # so an interrupted run can pick up exactly the items that never finished.
+    # Items go queued -> in_flight -> done | failed, handed out by
+    # async_job_queue; started items keep the wallet's pending nonce from when
+    # they started, which tells a later claimer how many of the item's
+    # transactions already went out.
+
+    def __init__(self, rpc_url: str = monad_rpc):
+        self.rpc_url = rpc_url
+
+    @property
+    def w3(self):
+        return get_async_web3(self.rpc_url)
+
+    async def create(self, mode: str, scripts: list) -> int:
+        run_id = await database.call(lambda conn: conn.execute(
+            "INSERT INTO route_runs (mode, status, created_at) VALUES (?, 'running', ?)", (mode, now_str())
+        ).lastrowid)
+        where, params = wallet_filter(MIN_ROUTE_BALANCE, require_proxy=True, alias="w.", healthy_proxy=True)
+        query = least_recent_runs_query(scripts, where, by_wallet=mode == "pipeline", by_script=mode == "script")
+        # insertion follows the planned order, so item ids double as positions
+        await database.execute(f"""
+            INSERT INTO route_items (run_id, address, script, status)
+            SELECT ?, address, script, 'queued' FROM ({query})
+        """, [run_id, *scripts, *params])
+        return run_id
+
+    async def unfinished(self):
+        row = await database.fetchone("""
+            SELECT r.id, r.mode, COUNT(i.id) AS remaining
+            FROM route_runs r JOIN route_items i ON i.run_id = r.id AND i.status IN ('queued', 'in_flight')
+            WHERE r.status = 'running'
+            GROUP BY r.id ORDER BY r.id DESC LIMIT 1
+        """)
+        return dict(row) if row else None
+
+    async def abort_unfinished(self):
+        await database.execute(
+            "UPDATE route_runs SET status = 'aborted', finished_at = ? WHERE status = 'running'", (now_str(),)
+        )
+
+    async def counts(self, run_id: int) -> dict:
+        rows = await database.fetchall(
+            "SELECT status, COUNT(*) FROM route_items WHERE run_id = ? GROUP BY status", (run_id,)
+        )
+        return {row[0]: row[1] for row in rows}
+
+    async def start_item(self, item_id: int, address: str, script: str, nonce_before: int = None,
+                         tx_count: int = 1) -> str:
+        # "run", or for an item that was started before (by a crashed or expired
+        # worker) and whose wallet nonce moved past nonce_before: "done" when all
+        # of the script's tx_count transactions went out, resubmitting would
+        # double-spend; "requeue" when only some did, so it runs again from scratch
+        nonce = await self.w3.eth.get_transaction_count(address, "pending")
+        # leases move wallets between processes, so never trust a cached nonce
+        nonce_manager.seed(self.w3, address, nonce)
+        if nonce_before is not None and nonce > nonce_before:
+            sent = nonce - nonce_before
+            done = sent >= tx_count
+            await database.execute(RECORD_RUN_SQL, (
+                address, script, now_str(), now_str(), "success" if done else "failed", None
+            ))
+            if done:
+                logger.info(f"Route item {item_id} for {address} already sent its transactions, marking done")
+                return "done"
+            logger.warning(f"Route item {item_id} for {address} sent {sent} of {tx_count} transactions, requeued")
+            return "requeue"
+        await database.execute(
+            "UPDATE route_items SET nonce_before = ?, updated_at = ? WHERE id = ?", (nonce, now_str(), item_id)
+        )
+        return "run"
+
+    async def finish(self, run_id: int):
+        await database.execute("""
+            UPDATE route_runs SET status = 'done', finished_at = ?
+            WHERE id = ? AND NOT EXISTS (
+                SELECT 1 FROM route_items WHERE run_id = ? AND status IN ('queued', 'in_flight')
+            )
+        """, (now_str(), run_id, run_id))
+
+
+route_plan = AsyncRoutePlan()
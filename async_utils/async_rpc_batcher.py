@@ -0,0 +1,78 @@
+import asyncio
+from loguru import logger
+
+
+class AsyncRpcBatcher:
+    # Collects JSON-RPC calls issued within `window` seconds (or until `max_size`
+    # calls are queued) and posts them as one batch, resolving each caller's future
+    # with its own response.
+
+    def __init__(self,
+                  provider,
+                    window: float,
+                      max_size: int
+        ):
+        self.provider = provider
+        self.window = window
+        self.max_size = max_size
+        self.enabled = True
+        self.pending = []
+        self.flush_handle = None
+        self.in_flight = set()
+
+    async def request(self, method, params):
+        if not self.enabled:
+            return await self.provider.make_unbatched_request(method, params)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((method, params, future))
+        if len(self.pending) >= self.max_size:
+            self.flush()
+        elif self.flush_handle is None:
+            self.flush_handle = loop.call_later(self.window, self.flush)
+        return await future
+
+    def flush(self):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        batch, self.pending = self.pending, []
+        if not batch:
+            return
+        task = asyncio.ensure_future(self.send(batch))
+        self.in_flight.add(task)
+        task.add_done_callback(self.in_flight.discard)
+
+    async def send(self, batch: list):
+        if len(batch) == 1:
+            await self.send_one(*batch[0])
+            return
+        try:
+            responses = await self.provider.make_batch_request([(method, params) for method, params, _ in batch])
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if not isinstance(responses, list) or len(responses) != len(batch):
+            # the endpoint rejected the batch as a whole; stop batching and replay singly
+            logger.warning(f"RPC {self.provider.endpoint_uri} does not accept batches, sending requests one by one")
+            self.enabled = False
+            await asyncio.gather(*[self.send_one(*item) for item in batch])
+            return
+
+        for (_, _, future), response in zip(batch, responses):
+            if not future.done():
+                future.set_result(response)
+
+    async def send_one(self, method, params, future):
+        try:
+            response = await self.provider.make_unbatched_request(method, params)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(response)
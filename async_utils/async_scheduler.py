@@ -0,0 +1,67 @@
+import asyncio
+from colorama import Fore, Style
+
+from async_utils.async_concurrency import concurrency
+from config import MAX_WORKERS, ADAPTIVE_CONCURRENCY
+
+
+class AsyncTaskScheduler:
+    # Runs queued jobs on a fixed pool of workers. Jobs sharing a key (a wallet
+    # address) never overlap, so one wallet's scripts still run one at a time.
+    # `jobs` may be a list or an async iterator; the queue is bounded, so an
+    # iterator is only read as fast as the workers drain it. With adaptive
+    # concurrency the pool is sized for the controller's maximum and its window
+    # decides how many of the workers may run a job at a time.
+
+    def __init__(self, max_workers: int = MAX_WORKERS, verbose: bool = True, adaptive: bool = ADAPTIVE_CONCURRENCY):
+        self.controller = concurrency if adaptive else None
+        self.max_workers = max(max_workers, self.controller.maximum) if adaptive else max_workers
+        self.verbose = verbose
+        self._locks = {}
+        self.total = 0
+        self.done = 0
+
+    async def run(self, jobs):
+        queue = asyncio.Queue(maxsize=self.max_workers * 2)
+        workers = [asyncio.ensure_future(self.worker(queue)) for _ in range(self.max_workers)]
+        try:
+            if hasattr(jobs, "__aiter__"):
+                async for job in jobs:
+                    await self.put(queue, job)
+            else:
+                for job in jobs:
+                    await self.put(queue, job)
+        finally:
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+
+    async def put(self, queue: asyncio.Queue, job: tuple):
+        self.total += 1
+        await queue.put(job)
+
+    async def worker(self, queue: asyncio.Queue):
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            key, job = item
+            # [lock, users]; dropped once no job for the key is running or waiting
+            entry = self._locks.setdefault(key, [asyncio.Lock(), 0])
+            entry[1] += 1
+            async with entry[0]:
+                try:
+                    if self.controller is None:
+                        await job()
+                    else:
+                        async with self.controller.slot():
+                            await job()
+                except Exception as e:
+                    print(Fore.RED + f"⚠️ Task for {key} failed: {e}" + Style.RESET_ALL)
+            entry[1] -= 1
+            if not entry[1]:
+                del self._locks[key]
+            self.done += 1
+            if self.verbose:
+                window = f" (window {self.controller.limit})" if self.controller is not None else ""
+                print(Fore.CYAN + f"📈 Progress: {self.done}/{self.total}{window}" + Style.RESET_ALL)
@@ -0,0 +1,138 @@
+import threading
+from collections import OrderedDict
+from eth_account import Account
+from eth_account.signers.local import LocalAccount
+from eth_utils import to_checksum_address
+
+from async_utils.async_db import database
+from sync_utils.user_agents import user_agents
+from config import PROXY_MAX_FAILURES, USER_AGENT_PER_WALLET, WALLET_CACHE_SIZE
+
+
+def proxy_url(proxy: str) -> str | None:
+    if not proxy:
+        return None
+    if not (proxy.startswith("http://") or proxy.startswith("socks5://")):
+        return f"http://{proxy}"
+    return proxy
+
+
+class Wallet:
+    # The LocalAccount is derived on first use and cached, so a wallet pays for
+    # key-to-address derivation once no matter how many tasks touch it.
+    __slots__ = ("address", "private_key", "proxy", "balance", "_account", "_user_agent")
+
+    def __init__(self, address: str, private_key: str, proxy: str = None, balance: float = None,
+                 account: LocalAccount = None):
+        self.address = to_checksum_address(address)
+        self.private_key = private_key
+        self.proxy = proxy
+        self.balance = balance
+        self._account = account
+        self._user_agent = None
+
+    @classmethod
+    def from_row(cls, row) -> "Wallet":
+        return wallet_cache.get(row)
+
+    @classmethod
+    def from_key(cls, private_key: str, proxy: str = None) -> "Wallet":
+        account = Account.from_key(private_key)
+        return cls(account.address, private_key, proxy, account=account)
+
+    @property
+    def account(self) -> LocalAccount:
+        if self._account is None:
+            self._account = Account.from_key(self.private_key)
+        return self._account
+
+    @property
+    def proxy_url(self) -> str | None:
+        return proxy_url(self.proxy)
+
+    async def get_user_agent(self) -> str:
+        if not USER_AGENT_PER_WALLET:
+            return user_agents.random()
+        if self._user_agent is None:
+            self._user_agent = await database.call(lambda conn: user_agents.for_wallet(conn, self.address))
+        return self._user_agent
+
+    def __repr__(self):
+        return f"Wallet({self.address})"
+
+
+class WalletCache:
+    # Wallets built from rows are kept per process by address (LRU, at most
+    # `size`), so a wallet claimed again reuses its derived account and user
+    # agent. Proxy and balance are refreshed from the row on every lookup.
+
+    def __init__(self, size: int = WALLET_CACHE_SIZE):
+        self.size = size
+        self._wallets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, row) -> Wallet:
+        address = row["address"]
+        with self._lock:
+            wallet = self._wallets.get(address)
+            if wallet is not None and wallet.private_key == row["private_key"]:
+                self._wallets.move_to_end(address)
+                wallet.proxy = row["proxy"]
+                wallet.balance = row["balance"]
+                return wallet
+            wallet = Wallet(address, row["private_key"], row["proxy"], row["balance"])
+            self._wallets[address] = wallet
+            if len(self._wallets) > self.size:
+                self._wallets.popitem(last=False)
+            return wallet
+
+
+wallet_cache = WalletCache()
+
+
+def as_wallet(wallet: "Wallet | str", proxy: str = None) -> Wallet:
+    # task classes still accept a bare private key
+    if isinstance(wallet, Wallet):
+        if proxy is not None and proxy != wallet.proxy:
+            return Wallet(wallet.address, wallet.private_key, proxy, wallet.balance, wallet._account)
+        return wallet
+    return Wallet.from_key(wallet, proxy)
+
+
+def wallet_filter(min_balance: float = None, require_proxy: bool = False, alias: str = "",
+                  healthy_proxy: bool = False) -> tuple:
+    conditions, params = [], []
+    if require_proxy:
+        conditions.append(f"{alias}proxy IS NOT NULL AND {alias}proxy != ''")
+    if healthy_proxy:
+        # proxies never checked count as healthy
+        conditions.append(f"{alias}proxy NOT IN (SELECT proxy FROM proxy_health WHERE failures >= ?)")
+        params.append(PROXY_MAX_FAILURES)
+    if min_balance is not None:
+        conditions.append(f"COALESCE({alias}balance, 0) >= ?")
+        params.append(min_balance)
+    return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+
+async def iter_wallets(min_balance: float = None, require_proxy: bool = False, healthy_proxy: bool = False):
+    where, params = wallet_filter(min_balance, require_proxy, healthy_proxy=healthy_proxy)
+    async for row in database.iterate(f"SELECT address, private_key, proxy, balance FROM wallets{where}", params):
+        yield Wallet.from_row(row)
+
+
+async def iter_addresses(size: int = None):
+    # yields lists of at most `size` addresses, for page-by-page balance scans
+    page = []
+    async for row in database.iterate("SELECT address FROM wallets"):
+        page.append(row["address"])
+        if size and len(page) >= size:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+async def count_wallets(min_balance: float = None, require_proxy: bool = False, healthy_proxy: bool = False) -> int:
+    where, params = wallet_filter(min_balance, require_proxy, healthy_proxy=healthy_proxy)
+    row = await database.fetchone(f"SELECT COUNT(*) FROM wallets{where}", params)
+    return row[0]
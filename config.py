@@ -1,9 +1,118 @@
 
 DB_NAME = "wallets.db"
+DB_WRITE_BATCH = 500
+IMPORT_CHUNK_SIZE = 5000
+WALLET_PAGE_SIZE = 1000
+# Wallet objects (with their derived accounts) kept per process for reuse
+WALLET_CACHE_SIZE = 10000
+BALANCE_SCAN_PAGE_SIZE = 5000
+MIN_ROUTE_BALANCE = 0.1
 PROXY_FILE = "proxy.txt"
 monad_rpc = 'https://testnet-rpc.monad.xyz/'
 arb_rpc = "https://1rpc.io/arb"
 
+MAX_WORKERS = 5
+# AIMD: the scheduler starts at MAX_WORKERS in-flight tasks and moves between
+# CONCURRENCY_MIN and CONCURRENCY_MAX by RPC p95 latency, error rate and 429s
+ADAPTIVE_CONCURRENCY = True
+CONCURRENCY_MIN = 1
+CONCURRENCY_MAX = 50
+CONCURRENCY_TARGET_P95 = 2.0
+CONCURRENCY_MAX_ERROR_RATE = 0.05
+CONCURRENCY_ADJUST_INTERVAL = 2
+CONCURRENCY_BACKOFF = 0.5
+# "pipeline": every wallet walks its own oldest-first script list;
+# "script": scripts run one after another across all wallets
+AUTO_ROUTE_MODE = "pipeline"
+# >1 drains the auto route with this many worker processes on this machine
+ROUTE_PROCESSES = 1
+ROUTE_PROGRESS_INTERVAL = 5
+# route workers lease (wallet, script) jobs; a lease not renewed within
+# JOB_LEASE_SECONDS is considered abandoned and the job goes back to the queue
+JOB_LEASE_SECONDS = 120
+JOB_HEARTBEAT_INTERVAL = 30
+JOB_POLL_INTERVAL = 5
+ENDPOINT_CONCURRENCY = {
+    "testnet-rpc.monad.xyz": 50,
+    "api.dial.to": 10,
+    "testnet-pathfinder-v2.monorail.xyz": 10,
+    "backend.gas.zip": 5,
+    "api.coingecko.com": 2,
+}
+# token buckets per host (requests/second, burst), shared by every task class;
+# they pace requests just under the providers' limits
+ENDPOINT_RATE_LIMITS = {
+    "testnet-rpc.monad.xyz": {"rps": 20, "burst": 40},
+    "api.dial.to": {"rps": 5, "burst": 10},
+    "testnet-pathfinder-v2.monorail.xyz": {"rps": 5, "burst": 10},
+    "backend.gas.zip": {"rps": 2, "burst": 5},
+    "api.coingecko.com": {"rps": 0.5, "burst": 2},
+}
+# extra bucket per (host, proxy) for calls made through a wallet proxy,
+# e.g. {"rps": 1, "burst": 3}; None disables it
+PROXY_RATE_LIMIT = None
+
+RPC_POOL_LIMIT = 200
+RPC_POOL_LIMIT_PER_HOST = 100
+RPC_KEEPALIVE_TIMEOUT = 60
+RPC_BATCH_ENABLED = True
+RPC_BATCH_WINDOW = 0.01
+RPC_BATCH_MAX_SIZE = 50
+# send each wallet's RPC calls through its proxy, with a connection pool per proxy
+RPC_THROUGH_PROXY = False
+RPC_PROXY_POOL_LIMIT = 20
+# per-proxy rate and in-flight cap for proxied RPC calls, on top of the host-wide
+# limits above; None / 0 disables them
+RPC_PROXY_RATE_LIMIT = {"rps": 5, "burst": 10}
+RPC_PROXY_CONCURRENCY = 10
+RPC_PROXY_LIMITERS_MAX = 1024
+
+# dApp HTTP APIs: one keep-alive session per (proxy, host)
+HTTP_POOL_MAX_SESSIONS = 256
+HTTP_POOL_IDLE_TIMEOUT = 120
+HTTP_POOL_LIMIT_PER_HOST = 10
+
+# proxies are probed through PROXY_CHECK_URL at most once per PROXY_CHECK_TTL;
+# a probe that fails or takes longer than PROXY_SLOW_LATENCY counts as a failure,
+# and PROXY_MAX_FAILURES failures in a row mark the proxy dead until it passes again
+PROXY_CHECK_URL = "https://httpbin.org/ip"
+PROXY_CHECK_TIMEOUT = 10
+PROXY_CHECK_CONCURRENCY = 50
+PROXY_CHECK_TTL = 600
+PROXY_SLOW_LATENCY = 5
+PROXY_MAX_FAILURES = 2
+PROXY_HEALTH_CACHE_TTL = 60
+
+# give each wallet one user agent for good and keep it in the wallets table
+USER_AGENT_PER_WALLET = True
+
+# Monorail quotes are cached per (from, to, amount) for this many seconds;
+# swap amounts are rounded down to MONORAIL_AMOUNT_DIGITS significant digits
+MONORAIL_QUOTE_TTL = 10
+MONORAIL_AMOUNT_DIGITS = 2
+
+BALANCE_SCAN_CONCURRENCY = 10
+BALANCE_SCAN_BATCH_SIZE = 200
+
+RECEIPT_POLL_INTERVAL = 2
+RECEIPT_BATCH_SIZE = 100
+RECEIPT_TIMEOUT = 120
+
+GAS_ORACLE_TTL = 5
+DEFAULT_GAS_POLICY = {
+    "type": "legacy",           # "legacy" -> gasPrice, "eip1559" -> maxFeePerGas/maxPriorityFeePerGas
+    "multiplier": 1.0,          # applied to eth_gasPrice (legacy) or the next base fee (eip1559)
+    "min_gwei": 0,
+    "max_gwei": 500,
+    "min_priority_gwei": 0,
+    "history_blocks": 5,
+    "reward_percentile": 50,
+}
+GAS_POLICIES = {
+    10143: {"type": "legacy", "multiplier": 1.1, "min_gwei": 50, "max_gwei": 200},   # Monad testnet
+    42161: {"type": "eip1559", "multiplier": 2, "min_gwei": 0.01, "max_gwei": 1},    # Arbitrum One
+}
+
 
 wallets  = [{'key': 'your_key1', 'proxy': 'user:pass@ip:port'},
             {'key': 'your_key2', 'proxy': 'user:pass@ip:port'}
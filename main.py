@@ -15,6 +15,8 @@ import datetime
 from sync_utils.sync_balance_native import SyncTokenBalanceChecker
 from sync_utils.create_evm_wallet import generate
 from sync_utils.buy_monad import GasZipBuyMonad
+from sync_utils.sync_chain_info import chain_info
+from sync_utils.db_schema import migrate, least_recent_runs_query, RECORD_RUN_SQL
 
 from sync_tasks.tasks.bean.bean import BeanExchange
 from sync_tasks.tasks.MONORAIL.swapper import MONORAIL
@@ -135,25 +137,7 @@ def clear_all_wallets():
 
 def init_db():
     with sqlite3.connect(DB_NAME) as conn:
-        cur = conn.cursor()
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS wallets (
-                address TEXT PRIMARY KEY,
-                private_key TEXT,
-                proxy TEXT,
-                balance REAL,
-                last_run_bean DATETIME,
-                last_run_kinza DATETIME,
-                last_run_magma DATETIME,
-                last_run_chog DATETIME,
-                last_run_dak DATETIME,
-                last_run_yaki DATETIME,
-                last_run_monorail DATETIME,
-                last_run_nft DATETIME,
-                last_run_pandaria DATETIME
-            )
-        """)
-        conn.commit()
+        migrate(conn)
 
 
 def get_all_wallets() -> List[Dict]:
@@ -219,13 +203,18 @@ def print_all_wallet_addresses():
 
 def update_last_run(script_name: str, address: str):
     now_str = datetime.datetime.now().isoformat(sep=' ', timespec='seconds')
-    col_name = f"last_run_{script_name}" 
     with sqlite3.connect(DB_NAME) as conn:
         cur = conn.cursor()
-        query = f"UPDATE wallets SET {col_name} = ? WHERE address = ?"
-        cur.execute(query, (now_str, address))
+        cur.execute(RECORD_RUN_SQL, (address, script_name, now_str, now_str, "success", None))
         conn.commit()
 
+
+def get_least_recent_runs(scripts: List[str]) -> List[Dict]:
+    with sqlite3.connect(DB_NAME) as conn:
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(least_recent_runs_query(scripts), scripts).fetchall()
+        return [dict(r) for r in rows]
+
 def update_wallet_proxy(address: str, proxy: str):
     with sqlite3.connect(DB_NAME) as conn:
         cur = conn.cursor()
@@ -432,6 +421,7 @@ def auto_route():
     print(f"📊 All wallets in DB: {len(all_wallets)}")
 
     tasks = defaultdict(list)
+    eligible = {}
     skipped_wallets = set() 
 
     for wallet in all_wallets:
@@ -450,11 +440,12 @@ def auto_route():
                 skipped_wallets.add(wallet["address"]) 
             continue
 
-        last_runs = {script: wallet.get(f"last_run_{script}") for script in SCRIPT_MAP.keys()}
-        sorted_scripts = sorted(last_runs.items(), key=lambda x: x[1] or "1970-01-01T00:00:00")
+        eligible[wallet["address"]] = wallet
 
-        for script, _ in sorted_scripts:
-            tasks[script].append(wallet)
+    for row in get_least_recent_runs(list(SCRIPT_MAP)):
+        wallet = eligible.get(row["address"])
+        if wallet is not None:
+            tasks[row["script"]].append(wallet)
 
     if not tasks:
         print(Fore.RED + "❌ There are no tasks for the auto-route." + Style.RESET_ALL)
@@ -633,6 +624,7 @@ def select_wallet_source():
 def main():
     init_db()
     print_banner()
+    chain_info.warm_up(monad_rpc, arb_rpc)
 
     while True:
         print("\n--- MAIN MENU ---")
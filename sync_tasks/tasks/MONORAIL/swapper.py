@@ -3,11 +3,13 @@ import random
 import json
 import requests
 from loguru import logger
-from fake_useragent import UserAgent
+from sync_utils.user_agents import user_agents
 from web3 import Web3
 from eth_account import Account
 from eth_utils import to_checksum_address
 from sync_utils.sync_balance_native import SyncTokenBalanceChecker
+from sync_utils.sync_chain_info import chain_info
+from sync_utils.sync_gas_oracle import gas_oracle
 
 class MONORAIL:
     def __init__(self, private_key: str, rpc: str, proxy: str = None):
@@ -59,13 +61,13 @@ class MONORAIL:
 
         contract = self.w3.eth.contract(address=contract_address, abi=abi)
         nonce = self.w3.eth.get_transaction_count(self.address, 'pending')
-        gas_price = max(self.w3.eth.gas_price, self.w3.to_wei(50, 'gwei'))
+        fees = gas_oracle.fee_params(self.w3)
 
         transaction = contract.functions.approve(
             spender_address, self.value_to_approve
         ).build_transaction({
-            "chainId": self.w3.eth.chain_id,
-            "gasPrice": gas_price,
+            "chainId": chain_info.chain_id(self.w3),
+            **fees,
             "nonce": nonce,
             "gas": 80000,
             "value": 0,
@@ -134,8 +136,7 @@ class MONORAIL:
 
     def monorail_swap(self):
 
-        ua = UserAgent()
-        user_agent = ua.random
+        user_agent = user_agents.random()
 
         from_token_name, from_token_address = self.choice_token()
 
@@ -164,15 +165,15 @@ class MONORAIL:
         try:
             address_to = to_checksum_address('0xC995498c22a012353FAE7eCC701810D673E25794')
             value_int = int(transaction["value"], 16)
-            gas_price = max(self.w3.eth.gas_price, self.w3.to_wei(50, 'gwei'))
+            fees = gas_oracle.fee_params(self.w3)
 
             tx_params = {
-                "chainId": self.w3.eth.chain_id,
+                "chainId": chain_info.chain_id(self.w3),
                 "nonce": self.w3.eth.get_transaction_count(self.address, 'latest'),
                 "to": address_to,
                 "data": transaction["data"],
                 "value": value_int,
-                "gasPrice": gas_price,
+                **fees,
             }
 
             try:
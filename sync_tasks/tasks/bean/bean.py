@@ -3,6 +3,7 @@ import time
 from eth_account import Account
 import random
 from sync_utils.sync_balance_native import SyncTokenBalanceChecker
+from sync_utils.sync_gas_oracle import gas_oracle
 from loguru import logger
 from decimal import Decimal
 
@@ -58,7 +59,7 @@ class BeanExchange:
                 "from": self.wallet_address,
                 "to": self.UNISWAP_ROUTER_ADDRESS,
                 "value": amount_in_wei,
-                "gasPrice": self.web3.eth.gas_price,
+                **gas_oracle.fee_params(self.web3),
                 "nonce": self.web3.eth.get_transaction_count(self.wallet_address),
                 "data": input_data
             }
@@ -93,7 +94,7 @@ class BeanExchange:
             tx = {
                 "from": self.wallet_address,
                 "to": self.BEAN_ADDRESS,
-                "gasPrice": self.web3.eth.gas_price,
+                **gas_oracle.fee_params(self.web3),
                 "nonce": self.web3.eth.get_transaction_count(self.wallet_address),
                 "data": input_data
             }
@@ -145,7 +146,7 @@ class BeanExchange:
                 "from": self.wallet_address,
                 "to": self.UNISWAP_ROUTER_ADDRESS,
                 "value": self.amount_eth_wei,
-                "gasPrice": self.web3.eth.gas_price,
+                **gas_oracle.fee_params(self.web3),
                 "nonce": self.web3.eth.get_transaction_count(self.wallet_address),
                 "data": input_data,
             }
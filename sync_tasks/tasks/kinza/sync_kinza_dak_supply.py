@@ -1,6 +1,8 @@
 import time
 from web3 import Web3
 from sync_utils.sync_balance_native import SyncTokenBalanceChecker
+from sync_utils.sync_chain_info import chain_info
+from sync_utils.sync_gas_oracle import gas_oracle
 from loguru import logger
 
 class Kinza:
@@ -71,8 +73,8 @@ class Kinza:
             withdraw_spender: str = "0x0F0BDEbF0F83cD1EE3974779Bcb7315f9808c714"
             nonce = self.web3.eth.get_transaction_count(self.wallet_address, "pending")
             amount_withdraw = 2**256 - 1 
-            gas_price = self.web3.eth.gas_price
-            chain_id = self.web3.eth.chain_id
+            fees = gas_oracle.fee_params(self.web3)
+            chain_id = chain_info.chain_id(self.web3)
             input_data = self.create_withdraw_input_data(withdraw_spender, amount_withdraw)
 
             tx = {
@@ -81,7 +83,7 @@ class Kinza:
                 "to": self.contract_address,
                 "data": input_data,
                 "gas": 300000,
-                "gasPrice": gas_price,
+                **fees,
                 "nonce": nonce
             }
             signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
@@ -100,10 +102,10 @@ class Kinza:
         try:
             spender: str = '0x590B03D84441c1277f32784d1fbC22Fe18b1eEe0'
             nonce = self.web3.eth.get_transaction_count(self.wallet_address, "pending")
-            gas_price = self.web3.to_wei(62, "gwei")
+            fees = gas_oracle.fee_params(self.web3)
             value: int = 115792089237316195423570985008687907853269984665640564039457584007913129639935
             gas_limit = 100000
-            chain_id = self.web3.eth.chain_id
+            chain_id = chain_info.chain_id(self.web3)
 
             tx = self.contract_approve.functions.approve(
                 Web3.to_checksum_address(spender), 
@@ -112,7 +114,7 @@ class Kinza:
                 "chainId": chain_id,
                 "from": self.wallet_address,
                 "gas": gas_limit,
-                "gasPrice": gas_price,
+                **fees,
                 "nonce": nonce
             })
 
@@ -125,15 +127,15 @@ class Kinza:
         try:
             input_data = self.create_supply_input_data()
             nonce = self.web3.eth.get_transaction_count(self.wallet_address, "pending")
-            gas_price = self.web3.to_wei(52, "gwei")
+            fees = gas_oracle.fee_params(self.web3)
             gas_limit = 300000
-            chain_id = self.web3.eth.chain_id
+            chain_id = chain_info.chain_id(self.web3)
 
             tx = {
                 "to": Web3.to_checksum_address(self.SUPPLY_ADDRESS),
                 "value": 0,
                 "gas": gas_limit,
-                "gasPrice": gas_price,
+                **fees,
                 "nonce": nonce,
                 "data": input_data,
                 "chainId": chain_id
@@ -2,6 +2,8 @@ import time
 import random
 from web3 import Web3
 from sync_utils.sync_balance_native import SyncTokenBalanceChecker
+from sync_utils.sync_chain_info import chain_info
+from sync_utils.sync_gas_oracle import gas_oracle
 from loguru import logger
 from decimal import Decimal
 
@@ -31,17 +33,16 @@ class MAGMA:
         try:
             value_eth = self.generate_value()
             value = self.web3.to_wei(value_eth, "ether")
-            gas_price_gwei = 62
-            gas_price = self.web3.to_wei(gas_price_gwei, "gwei")
+            fees = gas_oracle.fee_params(self.web3)
             nonce = self.web3.eth.get_transaction_count(self.wallet_address, "pending")
-            chain_id = self.web3.eth.chain_id
+            chain_id = chain_info.chain_id(self.web3)
 
             tx = {
                 "chainId": chain_id,
                 "nonce": nonce,
                 "to": self.contract_address,
                 "value": value,
-                "gasPrice": gas_price,
+                **fees,
                 "data": self.stake_function_selector,
             }
 
@@ -80,17 +81,16 @@ class MAGMA:
 
             input_data = self.create_unstake_input_data(balance)
             nonce = self.web3.eth.get_transaction_count(self.wallet_address, "pending")
-            gas_price_gwei = 50
             gas_limit = 200000
 
             tx = {
                 "to": self.contract_address,
                 "value": 0,
                 "gas": gas_limit,
-                "gasPrice": self.web3.to_wei(gas_price_gwei, "gwei"),
+                **gas_oracle.fee_params(self.web3),
                 "nonce": nonce,
                 "data": input_data,
-                "chainId": self.web3.eth.chain_id
+                "chainId": chain_info.chain_id(self.web3)
             }
 
             signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
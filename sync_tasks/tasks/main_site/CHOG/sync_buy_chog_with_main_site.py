@@ -3,11 +3,13 @@ import random
 import json
 import requests
 from loguru import logger
-from fake_useragent import UserAgent
+from sync_utils.user_agents import user_agents
 from web3 import Web3
 from eth_account import Account
 from eth_utils import to_checksum_address
 from sync_utils.sync_balance_native import SyncTokenBalanceChecker
+from sync_utils.sync_chain_info import chain_info
+from sync_utils.sync_gas_oracle import gas_oracle
 
 class BUY_CHOG:
     def __init__(self, private_key: str, rpc: str, proxy: str = None):
@@ -38,8 +40,7 @@ class BUY_CHOG:
 
     @staticmethod
     def generate_random_user_agent() -> str:
-        ua = UserAgent()
-        return ua.random
+        return user_agents.random()
 
     def sync_response_buy_chog(self):
         random_value = self.generate_random_value()
@@ -95,9 +96,9 @@ class BUY_CHOG:
         try:
             address_to = to_checksum_address(tx_lst["to"])
             value_int = int(tx_lst["value"], 16)
-            gas_price_int = int(tx_lst["gasPrice"]["value"])
+            fees = gas_oracle.fee_params(self.w3)
             nonce = self.w3.eth.get_transaction_count(self.address, 'pending')
-            chain_id = self.w3.eth.chain_id
+            chain_id = chain_info.chain_id(self.w3)
 
             tx_params = {
                 "chainId": chain_id,
@@ -106,7 +107,7 @@ class BUY_CHOG:
                 "data": tx_lst["data"],
                 "value": value_int,
                 "gas": tx_lst["gas"],
-                "gasPrice": gas_price_int,
+                **fees,
             }
 
             signed_tx = self.w3.eth.account.sign_transaction(tx_params, self.private_key)
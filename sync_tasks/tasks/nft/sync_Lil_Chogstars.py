@@ -3,6 +3,8 @@ from web3 import Web3
 from web3.providers import HTTPProvider
 from loguru import logger
 from sync_utils.sync_balance_native import SyncTokenBalanceChecker
+from sync_utils.sync_chain_info import chain_info
+from sync_utils.sync_gas_oracle import gas_oracle
 
 
 class NFTMinter:
@@ -39,10 +41,9 @@ class NFTMinter:
         try: 
             quantity: int = 1
             gas_limit: int = 200000
-            gas_price_gwei: int = 62
             nonce = self.web3.eth.get_transaction_count(self.wallet_address, "pending")
-            gas_price = self.web3.to_wei(gas_price_gwei, "gwei")
-            chain_id = self.web3.eth.chain_id
+            fees = gas_oracle.fee_params(self.web3)
+            chain_id = chain_info.chain_id(self.web3)
             mint_price_eth: float = 0.0
             mint_value = self.web3.to_wei(mint_price_eth, "ether")  
 
@@ -51,7 +52,7 @@ class NFTMinter:
                 "from": self.wallet_address,
                 "value": mint_value,  
                 "gas": gas_limit,
-                "gasPrice": gas_price,
+                **fees,
                 "nonce": nonce
             })
 
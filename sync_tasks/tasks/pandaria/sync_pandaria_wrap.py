@@ -3,6 +3,8 @@ from web3 import Web3
 from web3.providers import HTTPProvider
 import random
 from sync_utils.sync_balance_native import SyncTokenBalanceChecker
+from sync_utils.sync_chain_info import chain_info
+from sync_utils.sync_gas_oracle import gas_oracle
 from loguru import logger
 
 
@@ -42,23 +44,22 @@ class Pandaria:
 
 
     def sync_pandaria_deposit(self,
-                                 gas_limit: int = 100000,
-                                   gas_price_gwei: int = 62
+                                 gas_limit: int = 100000
         ):
         try:
             token_balance = self.checker.get_mon_balance()
             amount_to_swap = self.generate_random_value(token_balance)
             value = self.web3.to_wei(amount_to_swap, "ether")
-            gas_price = self.web3.to_wei(gas_price_gwei, "gwei")
+            fees = gas_oracle.fee_params(self.web3)
             nonce = self.web3.eth.get_transaction_count(self.wallet_address, "pending")
-            chain_id = self.web3.eth.chain_id
+            chain_id = chain_info.chain_id(self.web3)
 
             tx = self.contract.functions.deposit().build_transaction({
                 "chainId": chain_id,
                 "from": self.wallet_address,
                 "value": value,
                 "gas": gas_limit,
-                "gasPrice": gas_price,
+                **fees,
                 "nonce": nonce
             })
 
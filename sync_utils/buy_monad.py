@@ -3,6 +3,8 @@ from eth_account import Account
 import requests
 from loguru import logger
 from sync_utils.sync_balance_native import SyncTokenBalanceChecker
+from sync_utils.sync_chain_info import chain_info
+from sync_utils.sync_gas_oracle import gas_oracle
 
 
 class GasZipBuyMonad:
@@ -61,9 +63,9 @@ class GasZipBuyMonad:
             'to': to_address,
             'value': value_wei,
             'gas': 46896,
-            'gasPrice': self.web3.to_wei(0.01, 'gwei'),
+            **gas_oracle.fee_params(self.web3),
             'data': input_data,
-            'chainId': self.web3.eth.chain_id
+            'chainId': chain_info.chain_id(self.web3)
         }
 
         signed_tx = self.web3.eth.account.sign_transaction(tx, self.private_key)
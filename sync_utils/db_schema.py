@@ -0,0 +1,123 @@
+import sqlite3
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS wallets (
+        address TEXT PRIMARY KEY,
+        private_key TEXT,
+        proxy TEXT,
+        balance REAL,
+        user_agent TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS task_runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        address TEXT NOT NULL,
+        script TEXT NOT NULL,
+        started_at DATETIME,
+        finished_at DATETIME,
+        status TEXT,
+        tx_hash TEXT
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_task_runs_last ON task_runs (address, script, status, finished_at)",
+    """
+    CREATE TABLE IF NOT EXISTS tx_receipts (
+        tx_hash TEXT PRIMARY KEY,
+        address TEXT,
+        status INTEGER,
+        block_number INTEGER,
+        gas_used INTEGER,
+        confirmed_at DATETIME
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_tx_receipts_address ON tx_receipts (address)",
+    """
+    CREATE TABLE IF NOT EXISTS route_runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        mode TEXT,
+        status TEXT,
+        created_at DATETIME,
+        finished_at DATETIME
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS route_items (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        run_id INTEGER NOT NULL,
+        address TEXT NOT NULL,
+        script TEXT NOT NULL,
+        status TEXT NOT NULL,
+        nonce_before INTEGER,
+        lease_owner TEXT,
+        lease_expires REAL,
+        updated_at DATETIME,
+        UNIQUE (run_id, address, script)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_route_items_status ON route_items (run_id, status, id)",
+    """
+    CREATE TABLE IF NOT EXISTS proxy_health (
+        proxy TEXT PRIMARY KEY,
+        latency REAL,
+        last_ok DATETIME,
+        checked_at DATETIME,
+        failures INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+]
+
+RECORD_RUN_SQL = """
+    INSERT INTO task_runs (address, script, started_at, finished_at, status, tx_hash)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+def migrate(conn: sqlite3.Connection):
+    for statement in SCHEMA:
+        conn.execute(statement)
+
+    # older databases kept one last_run_<script> column per dApp on wallets;
+    # move those timestamps into task_runs and drop the columns
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(wallets)")]
+    for column in columns:
+        if not column.startswith("last_run_"):
+            continue
+        conn.execute(f"""
+            INSERT INTO task_runs (address, script, started_at, finished_at, status)
+            SELECT address, ?, {column}, {column}, 'success' FROM wallets WHERE {column} IS NOT NULL
+        """, (column[len("last_run_"):],))
+        conn.execute(f"ALTER TABLE wallets DROP COLUMN {column}")
+    if "user_agent" not in columns:
+        conn.execute("ALTER TABLE wallets ADD COLUMN user_agent TEXT")
+
+    # route_items from before job leases
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(route_items)")]
+    for column, column_type in (("lease_owner", "TEXT"), ("lease_expires", "REAL")):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE route_items ADD COLUMN {column} {column_type}")
+    conn.commit()
+
+
+def least_recent_runs_query(scripts: list, where: str = "", by_wallet: bool = False, by_script: bool = False) -> str:
+    # one row per (wallet, script), oldest successful run first; the correlated
+    # MAX is answered from idx_task_runs_last without touching the table.
+    # by_wallet keeps each wallet's rows together so they can be streamed as pipelines,
+    # by_script keeps each script's rows together, in the order scripts are given
+    values = ", ".join(f"({position}, ?)" for position in range(len(scripts)))
+    if by_wallet:
+        order = "w.address, last_run NULLS FIRST"
+    elif by_script:
+        order = "s.position, last_run NULLS FIRST, w.address"
+    else:
+        order = "last_run NULLS FIRST, w.address"
+    return f"""
+        WITH scripts(position, script) AS (VALUES {values})
+        SELECT w.address, w.private_key, w.proxy, w.balance, s.script, (
+            SELECT MAX(r.finished_at) FROM task_runs r
+            WHERE r.address = w.address AND r.script = s.script AND r.status = 'success'
+        ) AS last_run
+        FROM wallets w CROSS JOIN scripts s{where}
+        ORDER BY {order}
+    """
@@ -0,0 +1,22 @@
+from web3 import Web3
+
+
+# Pure fee math shared by the async and sync gas oracles: they fetch the chain
+# data, these turn it into transaction fee fields under a GAS_POLICIES entry.
+
+def legacy_fee_params(gas_price: int, policy: dict) -> dict:
+    gas_price = int(gas_price * policy["multiplier"])
+    gas_price = max(gas_price, Web3.to_wei(policy["min_gwei"], "gwei"))
+    gas_price = min(gas_price, Web3.to_wei(policy["max_gwei"], "gwei"))
+    return {"gasPrice": gas_price}
+
+
+def eip1559_fee_params(history: dict, policy: dict) -> dict:
+    base_fee = history["baseFeePerGas"][-1]
+    rewards = sorted(r[0] for r in history.get("reward") or [] if r)
+    priority_fee = rewards[len(rewards) // 2] if rewards else 0
+    priority_fee = max(priority_fee, Web3.to_wei(policy["min_priority_gwei"], "gwei"))
+    max_fee = int(base_fee * policy["multiplier"]) + priority_fee
+    max_fee = max(max_fee, Web3.to_wei(policy["min_gwei"], "gwei"))
+    max_fee = min(max_fee, Web3.to_wei(policy["max_gwei"], "gwei"))
+    return {"maxFeePerGas": max_fee, "maxPriorityFeePerGas": min(priority_fee, max_fee)}
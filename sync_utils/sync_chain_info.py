@@ -0,0 +1,29 @@
+import threading
+from loguru import logger
+from web3 import Web3
+
+
+class SyncChainInfo:
+
+    def __init__(self):
+        self._chain_ids = {}
+        self._lock = threading.Lock()
+
+    def chain_id(self, w3) -> int:
+        key = w3.provider.endpoint_uri
+        chain_id = self._chain_ids.get(key)
+        if chain_id is None:
+            chain_id = w3.eth.chain_id
+            with self._lock:
+                self._chain_ids[key] = chain_id
+        return chain_id
+
+    def warm_up(self, *rpc_urls: str):
+        for rpc_url in rpc_urls:
+            try:
+                self.chain_id(Web3(Web3.HTTPProvider(rpc_url)))
+            except Exception as e:
+                logger.warning(f"Could not read chain id from {rpc_url}: {e}")
+
+
+chain_info = SyncChainInfo()
@@ -0,0 +1,46 @@
+import threading
+import time
+
+from sync_utils.sync_chain_info import chain_info
+from sync_utils.gas_policy import legacy_fee_params, eip1559_fee_params
+from config import GAS_ORACLE_TTL, GAS_POLICIES, DEFAULT_GAS_POLICY
+
+
+class SyncGasOracle:
+    # Sync twin of async_gas_oracle: fee fields from a per-endpoint cache,
+    # refreshed at most once per `ttl` seconds under the same GAS_POLICIES.
+
+    def __init__(self, ttl: float = GAS_ORACLE_TTL, policies: dict = GAS_POLICIES):
+        self.ttl = ttl
+        self.policies = policies
+        self._fees = {}
+        self._lock = threading.Lock()
+
+    def policy(self, w3) -> dict:
+        return {**DEFAULT_GAS_POLICY, **self.policies.get(chain_info.chain_id(w3), {})}
+
+    def fee_params(self, w3) -> dict:
+        key = w3.provider.endpoint_uri
+        # one thread refreshes an endpoint while the others wait for its result
+        with self._lock:
+            cached = self._fees.get(key)
+            if cached is None or time.monotonic() - cached[0] >= self.ttl:
+                cached = (time.monotonic(), self.refresh(w3))
+                self._fees[key] = cached
+        return dict(cached[1])
+
+    def refresh(self, w3) -> dict:
+        policy = self.policy(w3)
+        if policy["type"] == "eip1559":
+            return self.eip1559_fees(w3, policy)
+        return self.legacy_fees(w3, policy)
+
+    def legacy_fees(self, w3, policy: dict) -> dict:
+        return legacy_fee_params(w3.eth.gas_price, policy)
+
+    def eip1559_fees(self, w3, policy: dict) -> dict:
+        history = w3.eth.fee_history(policy["history_blocks"], "latest", [policy["reward_percentile"]])
+        return eip1559_fee_params(history, policy)
+
+
+gas_oracle = SyncGasOracle()
@@ -0,0 +1,37 @@
+import random
+import sqlite3
+import threading
+from fake_useragent import UserAgent
+
+
+class UserAgentPool:
+    # fake_useragent parses its bundled browsers JSON on every UserAgent();
+    # the pool parses it once, on first use, and picks from a plain list.
+
+    def __init__(self):
+        self._agents = None
+        self._lock = threading.Lock()
+
+    @property
+    def agents(self) -> list:
+        if self._agents is None:
+            with self._lock:
+                if self._agents is None:
+                    ua = UserAgent()
+                    self._agents = [entry["useragent"] for entry in ua.data_browsers] or [ua.fallback]
+        return self._agents
+
+    def random(self) -> str:
+        return random.choice(self.agents)
+
+    def for_wallet(self, conn: sqlite3.Connection, address: str) -> str:
+        # the wallet keeps the first user agent it was given, across runs
+        row = conn.execute("SELECT user_agent FROM wallets WHERE address = ?", (address,)).fetchone()
+        if row is not None and row[0]:
+            return row[0]
+        agent = self.random()
+        conn.execute("UPDATE wallets SET user_agent = ? WHERE address = ?", (agent, address))
+        return agent
+
+
+user_agents = UserAgentPool()